@@ -2,12 +2,28 @@
 HTML cleaning and text chunking functionality for the Sales Factsheet Generation System.
 """
 
+import functools
 import logging
+import os
 import re
-from typing import Any, Dict, List
+from collections import deque
+from multiprocessing import Pool
+from typing import Any, Dict, Iterator, List, Tuple
 
 import trafilatura
 
+# Word tokenizer for streaming chunking; matches str.split() tokens
+_WORD_RE = re.compile(r"\S+")
+
+# Below this many companies the cost of spawning worker processes
+# outweighs the parallel speedup
+_MIN_PARALLEL_COMPANIES = 4
+
+# Punctuation classes collapsed by the _clean_text scan; frozensets give
+# O(1) membership checks in the per-character loop
+_SENTENCE_PUNCT = frozenset(".!?")
+_PAUSE_PUNCT = frozenset(",;")
+
 
 class ContentCleaner:
     """Clean and chunk HTML content for processing."""
@@ -20,7 +36,9 @@ class ContentCleaner:
             chunk_overlap: Overlap between chunks in tokens
         """
         self.chunk_size = chunk_size
-        self.chunk_overlap = chunk_overlap
+        # Clamp overlap so the chunking stride stays positive; an
+        # overlap >= chunk_size would otherwise never advance
+        self.chunk_overlap = min(chunk_overlap, chunk_size - 1)
         self.logger = logging.getLogger(__name__)
 
     def clean_html_content(self, html_content: str, url: str) -> Dict[str, Any]:
@@ -34,41 +52,60 @@ class ContentCleaner:
             Dict containing cleaned content and metadata
         """
         try:
-            # Use trafilatura to extract main content
-            extracted_text = trafilatura.extract(
-                html_content,
-                include_formatting=True,
-                include_links=True,
-                include_images=True,
-                include_tables=True,
-            )
+            # Trafilatura returns plain text, so residual HTML stripping
+            # is only needed on the raw-text fallback path
+            needs_html_strip = False
 
-            if not extracted_text:
-                # Fallback: use trafilatura with different settings
+            # Parse the DOM once and reuse the tree across extraction
+            # attempts; the parse dominates cleaning time
+            tree = trafilatura.load_html(html_content)
+
+            extracted_text = None
+            if tree is not None:
+                # Use trafilatura to extract main content
                 extracted_text = trafilatura.extract(
-                    html_content,
-                    include_formatting=False,
-                    include_links=False,
-                    include_images=False,
-                    include_tables=False,
+                    tree,
+                    include_formatting=True,
+                    include_links=True,
+                    include_images=True,
+                    include_tables=True,
                 )
 
+                if not extracted_text:
+                    # Fallback: use trafilatura with different settings
+                    extracted_text = trafilatura.extract(
+                        tree,
+                        include_formatting=False,
+                        include_links=False,
+                        include_images=False,
+                        include_tables=False,
+                    )
+
             if not extracted_text:
                 # Last resort: extract all text
                 try:
                     extracted_text = trafilatura.extract_text(html_content)
                 except AttributeError:
-                    # Fallback to basic text extraction
-                    from bs4 import BeautifulSoup
+                    if tree is not None:
+                        # Reuse the already-parsed lxml tree
+                        extracted_text = tree.text_content()
+                    else:
+                        # Fallback to basic text extraction
+                        from bs4 import BeautifulSoup
 
-                    soup = BeautifulSoup(html_content, "html.parser")
-                    extracted_text = soup.get_text()
+                        soup = BeautifulSoup(html_content, "html.parser")
+                        extracted_text = soup.get_text()
+                    needs_html_strip = True
 
             # Clean the extracted text
-            cleaned_text = self._clean_text(extracted_text)
+            cleaned_text = self._clean_text(
+                extracted_text, strip_html=needs_html_strip
+            )
 
-            # Chunk the text
-            chunks = self._chunk_text(cleaned_text)
+            # Chunk the text, keeping the word list so callers can
+            # re-chunk combined content without re-splitting
+            words = cleaned_text.split()
+            chunks = self._chunk_words(words)
 
             return {
                 "url": url,
@@ -78,6 +115,7 @@ class ContentCleaner:
                 "chunks": chunks,
                 "num_chunks": len(chunks),
                 "status": "success",
+                "_words": words,
             }
 
         except Exception as e:
@@ -93,11 +131,21 @@ class ContentCleaner:
                 "status": "failed",
             }
 
-    def _clean_text(self, text: str) -> str:
+    @staticmethod
+    def _clean_text(text: str, strip_html: bool = True) -> str:
         """Clean and normalize text content.
 
+        Performs a single forward scan over the text that collapses
+        whitespace runs, strips residual HTML tags and entities, and
+        deduplicates runs of punctuation. Doing all of this in one pass
+        avoids the repeated full-string allocations of chained
+        substitutions.
+
         Args:
             text: Raw text content
+            strip_html: Whether to strip residual HTML tags and entities.
+                Can be disabled when the text is already known to be
+                plain (e.g. trafilatura output).
 
         Returns:
             Cleaned text content
@@ -105,61 +153,169 @@ class ContentCleaner:
         if not text:
             return ""
 
-        # Remove extra whitespace
-        text = re.sub(r"\s+", " ", text)
+        # Collapse all whitespace runs in one C-level pass; this also
+        # subsumes the final strip
+        text = " ".join(text.split())
+
+        out: List[str] = []
+        n = len(text)
+        i = 0
+        pending_space = False
+
+        while i < n:
+            ch = text[i]
+
+            # Remaining separators are single spaces after the
+            # normalization above
+            if ch == " ":
+                pending_space = True
+                i += 1
+                continue
+
+            # Drop any remaining HTML tags (<...>)
+            if strip_html and ch == "<":
+                close = text.find(">", i + 1)
+                if close > i + 1:
+                    pending_space = True
+                    i = close + 1
+                    continue
+
+            # Drop HTML entities (&name;)
+            elif strip_html and ch == "&":
+                j = i + 1
+                while j < n and text[j].isalpha():
+                    j += 1
+                if j > i + 1 and j < n and text[j] == ";":
+                    pending_space = True
+                    i = j + 1
+                    continue
+
+            # Collapse runs of sentence punctuation to a single period
+            elif ch in _SENTENCE_PUNCT:
+                j = i + 1
+                while j < n and text[j] in _SENTENCE_PUNCT:
+                    j += 1
+                if pending_space and out:
+                    out.append(" ")
+                pending_space = False
+                out.append(ch if j == i + 1 else ".")
+                i = j
+                continue
+
+            # Collapse runs of commas/semicolons to a single comma
+            elif ch in _PAUSE_PUNCT:
+                j = i + 1
+                while j < n and text[j] in _PAUSE_PUNCT:
+                    j += 1
+                if pending_space and out:
+                    out.append(" ")
+                pending_space = False
+                out.append(ch if j == i + 1 else ",")
+                i = j
+                continue
+
+            # Regular character
+            if pending_space and out:
+                out.append(" ")
+            pending_space = False
+            out.append(ch)
+            i += 1
+
+        return "".join(out)
 
-        # Remove common HTML artifacts
-        text = re.sub(r"&[a-zA-Z]+;", " ", text)  # HTML entities
-        text = re.sub(r"<[^>]+>", " ", text)  # Any remaining HTML tags
+    def _chunk_text(self, text: str) -> List[str]:
+        """Split text into overlapping chunks.
 
-        # Remove excessive punctuation
-        text = re.sub(r"[.!?]{2,}", ".", text)
-        text = re.sub(r"[,;]{2,}", ",", text)
+        Args:
+            text: Text to chunk
 
-        # Remove excessive spaces
-        text = re.sub(r" +", " ", text)
+        Returns:
+            List of text chunks
+        """
+        if not text:
+            return []
 
-        # Strip leading/trailing whitespace
-        text = text.strip()
+        return list(self._iter_chunks(text))
 
-        return text
+    def _iter_chunks(self, text: str) -> Iterator[str]:
+        """Lazily yield overlapping chunks of text.
 
-    def _chunk_text(self, text: str) -> List[str]:
-        """Split text into overlapping chunks.
+        Streams over the words with a bounded sliding window of
+        character spans instead of materializing the full word list, so
+        memory stays O(chunk_size) regardless of document length. Each
+        chunk is a direct slice of the input text.
 
         Args:
             text: Text to chunk
 
+        Yields:
+            Text chunks
+        """
+        chunk_size = self.chunk_size
+        stride = chunk_size - self.chunk_overlap
+
+        window: "deque[Tuple[int, int]]" = deque()
+        yielded_full_chunk = False
+
+        for match in _WORD_RE.finditer(text):
+            if len(window) == chunk_size:
+                # A further word exists, so this window is a full chunk
+                yield text[window[0][0] : window[-1][1]]
+                yielded_full_chunk = True
+                for _ in range(stride):
+                    window.popleft()
+            window.append(match.span())
+
+        if not yielded_full_chunk:
+            # Text fits in a single chunk
+            yield text
+            return
+
+        # Emit the remaining tail windows
+        while window:
+            yield text[window[0][0] : window[-1][1]]
+            if len(window) <= stride:
+                break
+            for _ in range(stride):
+                window.popleft()
+
+    def _chunk_words(self, words: List[str]) -> List[str]:
+        """Split a pre-tokenized word list into overlapping chunks.
+
+        Args:
+            words: Words to chunk (as produced by str.split)
+
         Returns:
             List of text chunks
         """
-        if not text:
-            return []
+        num_words = len(words)
 
-        # Simple tokenization (split by words)
-        words = text.split()
+        if num_words == 0:
+            return []
 
-        if len(words) <= self.chunk_size:
-            return [text]
+        # Bind attributes to locals once; attribute lookups in the loop
+        # are markedly slower than local loads
+        chunk_size = self.chunk_size
+        stride = chunk_size - self.chunk_overlap
 
-        chunks = []
-        start = 0
+        # Join once and map word indices to character offsets so each
+        # chunk is a direct slice of the joined text instead of a
+        # per-chunk sublist plus join
+        joined = " ".join(words)
 
-        while start < len(words):
-            # Calculate end position
-            end = start + self.chunk_size
+        if num_words <= chunk_size:
+            return [joined]
 
-            # Extract chunk
-            chunk_words = words[start:end]
-            chunk_text = " ".join(chunk_words)
-            chunks.append(chunk_text)
+        offsets = [0]
+        for word in words:
+            offsets.append(offsets[-1] + len(word) + 1)
 
-            # Move start position with overlap
-            start = end - self.chunk_overlap
+        chunks = []
 
-            # Ensure we don't go backwards
-            if start >= len(words):
-                break
+        for start in range(0, num_words, stride):
+            # Extract chunk directly from the joined text
+            stop = min(start + chunk_size, num_words)
+            chunks.append(joined[offsets[start] : offsets[stop] - 1])
 
         return chunks
 
@@ -172,9 +328,16 @@ class ContentCleaner:
         Returns:
             Processed content with cleaned text and chunks
         """
-        url = scraped_data.get("url", "")
-
-        if scraped_data.get("status") != "success":
+        # Unpack the fields of interest once instead of probing the
+        # dict per field
+        url, status, homepage_content, about_text = (
+            scraped_data.get("url", ""),
+            scraped_data.get("status", ""),
+            scraped_data.get("homepage_content", ""),
+            scraped_data.get("about_text", ""),
+        )
+
+        if status != "success":
             return {
                 "url": url,
                 "cleaned_text": "",
@@ -183,27 +346,42 @@ class ContentCleaner:
                 "status": "failed",
             }
 
-        # Combine homepage and about page content
-        homepage_content = scraped_data.get("homepage_content", "")
-        about_text = scraped_data.get("about_text", "")
-
         # Clean homepage content
         homepage_cleaned = self.clean_html_content(homepage_content, url)
 
         # Process about page if available
         about_cleaned = None
         if about_text:
-            # Create a simple HTML wrapper for about text
-            about_html = f"<html><body><div>{about_text}</div></body></html>"
-            about_cleaned = self.clean_html_content(about_html, url)
-
-        # Combine results
+            if "<" in about_text[:200]:
+                # Looks like real markup: run the full DOM pipeline
+                about_cleaned = self.clean_html_content(about_text, url)
+            else:
+                # Already plain text from the scraper; skip the DOM
+                # parse and clean it directly
+                cleaned = self._clean_text(about_text)
+                words = cleaned.split()
+                chunks = self._chunk_words(words)
+                about_cleaned = {
+                    "url": url,
+                    "original_length": len(about_text),
+                    "cleaned_length": len(cleaned),
+                    "cleaned_text": cleaned,
+                    "chunks": chunks,
+                    "num_chunks": len(chunks),
+                    "status": "success",
+                    "_words": words,
+                }
+
+        # Combine results, reusing the word lists already split during
+        # cleaning so the combined text is not re-tokenized
         combined_text = homepage_cleaned.get("cleaned_text", "")
+        combined_words = homepage_cleaned.get("_words", [])
         if about_cleaned and about_cleaned.get("cleaned_text"):
             combined_text += "\n\n" + about_cleaned.get("cleaned_text", "")
+            combined_words = combined_words + about_cleaned.get("_words", [])
 
-        # Re-chunk the combined text
-        combined_chunks = self._chunk_text(combined_text)
+        # Re-chunk the combined word list
+        combined_chunks = self._chunk_words(combined_words)
 
         return {
             "url": url,
@@ -227,6 +405,25 @@ class ContentCleaner:
         Returns:
             List of processed content dictionaries
         """
+        # Cleaning is CPU-bound (DOM parsing, text scanning, chunking),
+        # so larger batches are fanned out across worker processes.
+        # imap_unordered streams results back as workers finish, so one
+        # oversized page cannot stall the whole batch
+        if len(scraped_data_list) >= _MIN_PARALLEL_COMPANIES:
+            worker = functools.partial(
+                _process_one,
+                chunk_size=self.chunk_size,
+                chunk_overlap=self.chunk_overlap,
+            )
+            num_workers = os.cpu_count() or 1
+            chunksize = max(1, len(scraped_data_list) // (4 * num_workers))
+            with Pool(processes=num_workers) as pool:
+                return list(
+                    pool.imap_unordered(
+                        worker, scraped_data_list, chunksize=chunksize
+                    )
+                )
+
         processed_results = []
 
         for scraped_data in scraped_data_list:
@@ -251,6 +448,38 @@ class ContentCleaner:
         return processed_results
 
 
+# Module-level worker so it can be pickled into worker processes
+def _process_one(
+    scraped_data: Dict[str, Any], chunk_size: int, chunk_overlap: int
+) -> Dict[str, Any]:
+    """Process one company's scraped content in a worker process.
+
+    Args:
+        scraped_data: Scraped data dictionary for a single company
+        chunk_size: Size of text chunks in tokens (approximate)
+        chunk_overlap: Overlap between chunks in tokens
+
+    Returns:
+        Processed content dictionary
+    """
+    cleaner = ContentCleaner(chunk_size, chunk_overlap)
+    try:
+        return cleaner.process_scraped_content(scraped_data)
+    except Exception as e:
+        return {
+            "url": scraped_data.get("url", ""),
+            "cleaned_text": "",
+            "chunks": [],
+            "error": str(e),
+            "status": "failed",
+        }
+
+
+# Cleaner instances are stateless apart from their configuration, so a
+# small cache avoids re-allocating one per call in tight loops
+_get_cleaner = functools.lru_cache(maxsize=8)(ContentCleaner)
+
+
 # Convenience function for synchronous usage
 def clean_content_sync(
     html_content: str,
@@ -269,5 +498,6 @@ def clean_content_sync(
     Returns:
         Cleaned content dictionary
     """
-    cleaner = ContentCleaner(chunk_size, chunk_overlap)
-    return cleaner.clean_html_content(html_content, url)
+    return _get_cleaner(chunk_size, chunk_overlap).clean_html_content(
+        html_content, url
+    )
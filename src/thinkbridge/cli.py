@@ -0,0 +1,57 @@
+"""
+Command-line entry point for the Sales Factsheet Generation System.
+
+Kept separate from ingest.py so invoking --help only pays for click,
+not for the pipeline's heavy imports.
+"""
+
+import click
+
+
+@click.command()
+@click.argument("csv_file", type=click.Path(exists=True))
+@click.option("--max-concurrent", "-c", default=8, help="Maximum concurrent jobs")
+@click.option(
+    "--checkpoint", "-cp", default="checkpoint.json", help="Checkpoint file path"
+)
+@click.option(
+    "--enable-vector-store/--disable-vector-store",
+    default=True,
+    help="Enable/disable vector store integration",
+)
+@click.option(
+    "--force-rescrape",
+    is_flag=True,
+    default=False,
+    help="Force re-scraping even if extracted data exists",
+)
+def main(
+    csv_file: str,
+    max_concurrent: int,
+    checkpoint: str,
+    enable_vector_store: bool,
+    force_rescrape: bool,
+) -> None:
+    """Ingest company data from CSV and orchestrate processing jobs.
+
+    CSV_FILE: Path to CSV file with 'url' and 'industry' columns
+
+    This command will:
+    1. Scrape company websites using Firecrawl + httpx fallback
+    2. Clean and chunk the content using trafilatura
+    3. Store text chunks in OpenAI FileStore for RAG retrieval
+    4. Track costs and maintain budget constraints
+    """
+    # Imported here so --help renders without loading the pipeline
+    from .ingest import IngestCLI
+
+    try:
+        ingest = IngestCLI(csv_file, checkpoint, enable_vector_store, force_rescrape)
+        ingest.run(max_concurrent)
+    except Exception as e:
+        click.echo(f"Error: {e}", err=True)
+        raise click.Abort()
+
+
+if __name__ == "__main__":
+    main()
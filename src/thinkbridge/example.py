@@ -4,8 +4,16 @@ Example module demonstrating basic functionality.
 
 from typing import Any
 
+import orjson
 import requests
 
+# Greeting template built once at import time
+_GREETING_TEMPLATE = "Hello, {}! Welcome to Thinkbridge."
+
+# Shared session so repeated fetches reuse pooled connections instead of
+# paying TCP/TLS setup per request
+_SESSION = requests.Session()
+
 
 def fetch_data(url: str) -> dict[str, Any]:
     """
@@ -20,9 +28,11 @@ def fetch_data(url: str) -> dict[str, Any]:
     Raises:
         requests.RequestException: If the request fails
     """
-    response = requests.get(url)
+    response = _SESSION.get(url)
     response.raise_for_status()
-    return response.json()
+    # orjson parses the raw bytes directly, skipping the stdlib JSON
+    # decoder and its intermediate str allocation
+    return orjson.loads(response.content)
 
 
 def greet(name: str) -> str:
@@ -35,4 +45,4 @@ def greet(name: str) -> str:
     Returns:
         str: A greeting message
     """
-    return f"Hello, {name}! Welcome to Thinkbridge."
+    return _GREETING_TEMPLATE.format(name)
@@ -5,18 +5,130 @@ This module implements the RAG (Retrieval-Augmented Generation) workflow
 to generate industry-specific factsheets using templates and vector store data.
 """
 
+import asyncio
+import functools
+import hashlib
+import json
 import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from types import MappingProxyType
 from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
 
+import tiktoken
+from diskcache import Cache
 from openai import OpenAI
 
 from .store import VectorStore
 from .template_manager import TemplateManager
 
+# Cached results expire after a week: long enough for template
+# iteration, short enough that stale company data ages out
+_DISK_CACHE_TTL_SECONDS = 7 * 86400
+
+# Map placeholders to natural language queries with enhanced geographic
+# terms. Built once at import time and wrapped read-only since it is
+# shared across generator instances.
+_PLACEHOLDER_QUERIES = MappingProxyType(
+    {
+        "company_overview": "company overview mission vision about",
+        "business_focus": "business focus core services main activities",
+        "products_services": "products services offerings solutions",
+        "market_position": "market position competitive advantage",
+        "key_metrics": "performance metrics financial results revenue",
+        "recent_developments": "recent news updates developments announcements",
+        "leadership_team": "leadership team management executives founders",
+        "locations_operations": "locations offices operations facilities",
+        "financial_highlights": "financial performance revenue profit growth",
+        "growth_strategy": "strategy growth plans future expansion",
+        "technology_stack": "technology platform technical infrastructure",
+        "construction_specialties": "construction projects building specialties",
+        "certifications_licenses": "certifications licenses accreditations",
+        "safety_record": "safety record standards compliance",
+        "healthcare_focus": "healthcare medical clinical focus areas",
+        "regulatory_compliance": "regulatory compliance approvals standards",
+        # Enhanced geographic queries with specific city names from Drees data
+        "geographic_coverage": "Austin Cincinnati Cleveland Dallas Houston Indianapolis Jacksonville Nashville Raleigh San Antonio Washington new home discover locations",
+        "locations": "Austin Cincinnati Cleveland Dallas Houston Indianapolis Jacksonville Nashville Raleigh San Antonio Washington locations cities markets",
+        "service_areas": "Austin Cincinnati Cleveland Dallas Houston Indianapolis Jacksonville Nashville Raleigh San Antonio Washington service areas",
+        # Construction specific
+        "services_offered": "home building construction services custom homes",
+        "key_projects": "projects portfolio recent contracts communities developments",
+        "industry_recognition": "awards recognition national excellence top builder",
+        "competitive_advantages": "advantages benefits stress-free building experience DreeSmart",
+        "sustainability_initiatives": "sustainability environment green energy efficient DreeSmart",
+    }
+)
+
+
+def _to_chunk(obj: Any) -> Optional[Dict[str, Any]]:
+    """Normalize a similarity-search hit to the dict chunk format.
+
+    VectorStore.similarity_search returns (content, score) tuples while
+    the vector path and some callers hand over dicts; normalizing once
+    at the boundary keeps the downstream dedup loop shape-agnostic.
+
+    Args:
+        obj: A raw search hit (dict or (content, score) sequence)
+
+    Returns:
+        Chunk dict, or None for malformed hits
+    """
+    if isinstance(obj, dict):
+        return obj
+    if isinstance(obj, (tuple, list)) and len(obj) >= 2:
+        return {"content": obj[0], "score": obj[1]}
+    return None
+
+
+# Evidence section headers, precomputed so prompt assembly indexes into
+# a tuple instead of running f-string formatting per chunk
+_EVIDENCE_HEADERS = tuple(f"Evidence {i}:\n" for i in range(1, 33))
+
+
+# Location-related placeholders that trigger the geographic fallback query
+_GEOGRAPHIC_PLACEHOLDERS = frozenset(
+    {
+        "geographic_coverage",
+        "locations",
+        "service_areas",
+        "locations_operations",
+        "markets",
+        "regions",
+    }
+)
+
 
 class FactsheetGenerator:
     """Generates company factsheets using RAG with templates and vector data."""
 
+    # Invariant prompt prefix. Keeping every static instruction ahead of
+    # the per-company content lets backends with prefix caching reuse the
+    # prefill for this block across companies (for self-hosted vLLM, run
+    # with --enable-prefix-caching).
+    STATIC_PROMPT_HEADER = """You are a professional business analyst creating a comprehensive factsheet for a company.
+
+INSTRUCTIONS:
+1. Generate a comprehensive factsheet by filling in ALL placeholders in the template
+2. Use ONLY information from the provided evidence - do not hallucinate
+3. If specific information is not available in the evidence, write "Information not available in source material"
+4. Use professional, factual language appropriate for sales teams
+5. Maintain the exact Markdown structure of the template
+6. Replace {company_name} with the actual company name from the evidence or URL
+7. Focus on factual, evidence-based content that would be useful for sales prospecting
+
+QUALITY REQUIREMENTS:
+- Be specific and detailed where evidence supports it
+- Use exact quotes or paraphrases from the evidence
+- Maintain professional tone throughout
+- Ensure all sections add value for sales teams
+- If a section cannot be filled with evidence, clearly state the limitation"""
+
     def __init__(
         self,
         openai_api_key: Optional[str] = None,
@@ -24,6 +136,8 @@ class FactsheetGenerator:
         model: str = "gpt-4",
         max_tokens: int = 2000,
         temperature: float = 0.3,
+        structured_output: bool = False,
+        cache_dir: Optional[str] = None,
     ):
         """Initialize the factsheet generator.
 
@@ -33,11 +147,19 @@ class FactsheetGenerator:
             model: OpenAI model to use for generation.
             max_tokens: Maximum tokens for generation.
             temperature: Generation temperature (0=deterministic, 1=creative).
+            structured_output: Generate per-section JSON via a strict
+                json_schema response format and assemble the markdown
+                client-side, instead of free-form generation with
+                word-count retries. Requires a model that supports
+                structured outputs.
+            cache_dir: Directory for the persistent result cache.
+                Defaults to ~/.cache/thinkbridge/factsheets.
         """
         self.logger = self._setup_logging()
         self.model = model
         self.max_tokens = max_tokens
         self.temperature = temperature
+        self.structured_output = structured_output
 
         # Initialize components
         self.openai_client = self._get_openai_client(openai_api_key)
@@ -50,10 +172,51 @@ class FactsheetGenerator:
         self.max_word_count = 1000
         self.top_k_chunks = 6  # As specified in the requirements
 
-        # Cost tracking
+        # Cost tracking. generate_factsheet runs concurrently in worker
+        # threads (see _generate_all_async), so the shared cost and
+        # cache-hit counters are guarded by a lock
         self.total_generation_cost = 0.0
+        self._stats_lock = threading.Lock()
 
-        self.logger.info(f"FactsheetGenerator initialized with model {model}")
+        # BPE encoder for accurate token counting; built once here since
+        # encoder construction is expensive. Falls back to the old
+        # 4-chars-per-token heuristic if the BPE files are unavailable.
+        try:
+            self._token_encoder = tiktoken.encoding_for_model(model)
+        except Exception:
+            try:
+                self._token_encoder = tiktoken.get_encoding("cl100k_base")
+            except Exception:
+                self._token_encoder = None
+
+        # Result caches: repeated runs over the same companies should hit
+        # a dict instead of re-paying the vector query and GPT-4 call.
+        # Factsheets are keyed on (url, industry, template) so editing a
+        # template invalidates its cached factsheets automatically.
+        self._factsheet_cache: Dict[str, Dict[str, Any]] = {}
+        self._search_cache: Dict[Tuple[str, str], List[Any]] = {}
+        # Assembled evidence per company: reused across industry runs
+        # (and retries) for the same company_url, since the underlying
+        # website data is identical regardless of template
+        self._evidence_cache: Dict[str, List[Dict[str, Any]]] = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+        # Disk-backed tier under the in-memory caches so restart-heavy
+        # dev loops reuse prior factsheets and search results instead of
+        # re-paying the GPT-4 and retrieval costs on every cold start
+        try:
+            self._disk_cache: Optional[Cache] = Cache(
+                cache_dir
+                or os.path.expanduser("~/.cache/thinkbridge/factsheets"),
+                size_limit=int(1e9),
+                statistics=True,
+            )
+        except Exception as e:
+            self.logger.warning("Disk cache unavailable: %s", e)
+            self._disk_cache = None
+
+        self.logger.info("FactsheetGenerator initialized with model %s", model)
 
     def _setup_logging(self) -> logging.Logger:
         """Set up structured logging for the generator."""
@@ -80,8 +243,6 @@ class FactsheetGenerator:
         Raises:
             ValueError: If no API key provided
         """
-        import os
-
         if api_key:
             return OpenAI(api_key=api_key)
 
@@ -94,6 +255,72 @@ class FactsheetGenerator:
 
         return OpenAI(api_key=api_key)
 
+    def _cache_factsheet(self, cache_key: str, result: Dict[str, Any]) -> None:
+        """Store a factsheet result in the memory and disk cache tiers.
+
+        Args:
+            cache_key: Factsheet cache key
+            result: Generation result to cache
+        """
+        self._factsheet_cache[cache_key] = dict(result)
+        if self._disk_cache is not None:
+            try:
+                self._disk_cache.set(
+                    cache_key, dict(result), expire=_DISK_CACHE_TTL_SECONDS
+                )
+            except Exception as e:
+                self.logger.warning("Failed to persist factsheet cache: %s", e)
+
+    def _cache_search(
+        self, company_url: str, query: str, chunks: List[Any]
+    ) -> None:
+        """Store a similarity-search result in both cache tiers.
+
+        Args:
+            company_url: Company the search ran against
+            query: Search query text
+            chunks: Search results to cache
+        """
+        self._search_cache[(company_url, query)] = chunks
+        if self._disk_cache is not None:
+            try:
+                self._disk_cache.set(
+                    f"search:{company_url}|{query}",
+                    chunks,
+                    expire=_DISK_CACHE_TTL_SECONDS,
+                )
+            except Exception as e:
+                self.logger.warning("Failed to persist search cache: %s", e)
+
+    def invalidate(self, company_url: str) -> int:
+        """Drop all cached results for a company.
+
+        Call after re-scraping a company so fresh content is retrieved
+        and generated instead of served from stale cache entries.
+
+        Args:
+            company_url: Company whose cache entries should be removed
+
+        Returns:
+            Number of disk cache entries removed
+        """
+        self._evidence_cache.pop(company_url, None)
+        for key in [k for k in self._search_cache if k[0] == company_url]:
+            del self._search_cache[key]
+        for key in [
+            k for k in self._factsheet_cache if f":{company_url}|" in k
+        ]:
+            del self._factsheet_cache[key]
+
+        removed = 0
+        if self._disk_cache is not None:
+            marker = f":{company_url}|"
+            for key in list(self._disk_cache):
+                if isinstance(key, str) and marker in key:
+                    del self._disk_cache[key]
+                    removed += 1
+        return removed
+
     def _retrieve_relevant_chunks(
         self, company_url: str, template_placeholders: List[str]
     ) -> List[Dict[str, Any]]:
@@ -107,65 +334,131 @@ class FactsheetGenerator:
             List of relevant text chunks with metadata
         """
         try:
+            # Evidence is identical for a company regardless of which
+            # template requested it, so reuse it across industry runs
+            cached_evidence = self._evidence_cache.get(company_url)
+            if cached_evidence is not None:
+                self.logger.info("Evidence cache hit for %s", company_url)
+                return cached_evidence
+
             # Get company's vector store ID
             store_id = self.vector_store.get_company_store_id(company_url)
             if not store_id:
-                self.logger.warning(f"No vector store found for {company_url}")
+                self.logger.warning("No vector store found for %s", company_url)
                 return []
 
-            # Create search queries based on template placeholders
-            search_queries = self._create_search_queries(template_placeholders)
+            # Create search queries based on template placeholders,
+            # deduplicated so no vector-store call is issued twice
+            search_queries = list(
+                dict.fromkeys(self._create_search_queries(template_placeholders))
+            )
 
-            all_chunks = []
+            # The per-query searches are independent network round-trips,
+            # so run the uncached ones concurrently; retrieval latency is
+            # then the slowest query instead of the sum of all of them.
+            top_k_per_query = self.top_k_chunks // len(search_queries)
+            results_by_query: Dict[str, List[Any]] = {}
+            pending_queries = []
             for query in search_queries:
+                cached = self._search_cache.get((company_url, query))
+                if cached is None and self._disk_cache is not None:
+                    cached = self._disk_cache.get(f"search:{company_url}|{query}")
+                    if cached is not None:
+                        self._search_cache[(company_url, query)] = cached
+                if cached is not None:
+                    results_by_query[query] = cached
+                else:
+                    pending_queries.append(query)
+
+            # When the store holds a local embedding index for this
+            # company, embed all queries in one batched API call and rank
+            # locally — one embeddings request instead of one per query.
+            # The explicit bool check keeps stubbed stores without a real
+            # index on the fallback path below.
+            if pending_queries and (
+                self.vector_store.has_local_index(company_url) is True
+            ):
                 try:
-                    chunks = self.vector_store.similarity_search(
-                        query=query,
-                        company_id=company_url,  # Use the company identifier
-                        top_k=self.top_k_chunks
-                        // len(search_queries),  # Distribute across queries
-                        max_distance=0.25,  # As per requirements
-                    )
-                    all_chunks.extend(chunks)
+                    query_vectors = self.vector_store.embed_queries(pending_queries)
+                    for query, vector in zip(pending_queries, query_vectors):
+                        chunks = self.vector_store.similarity_search_vectors(
+                            vector,
+                            company_id=company_url,
+                            top_k=top_k_per_query,
+                            max_distance=0.25,
+                        )
+                        self._cache_search(company_url, query, chunks)
+                        results_by_query[query] = chunks
+                    pending_queries = []
                 except Exception as e:
-                    self.logger.warning(f"Search failed for query '{query}': {e}")
+                    self.logger.warning(
+                        "Batched vector search failed, falling back: %s", e
+                    )
+
+            if pending_queries:
+                with ThreadPoolExecutor(
+                    max_workers=len(pending_queries)
+                ) as executor:
+                    futures = {
+                        executor.submit(
+                            self.vector_store.similarity_search,
+                            query=query,
+                            company_id=company_url,  # Use the company identifier
+                            top_k=top_k_per_query,  # Distribute across queries
+                            max_distance=0.25,  # As per requirements
+                        ): query
+                        for query in pending_queries
+                    }
+                    # allSettled semantics: one failed query is logged and
+                    # skipped, the rest still contribute evidence
+                    for future in as_completed(futures):
+                        query = futures[future]
+                        try:
+                            chunks = future.result()
+                        except Exception as e:
+                            self.logger.warning(
+                                "Search failed for query '%s': %s", query, e
+                            )
+                            continue
+                        self._cache_search(company_url, query, chunks)
+                        results_by_query[query] = chunks
 
-            # Remove duplicates and limit to top_k
-            # Note: chunks are tuples (content, score) from similarity_search
-            seen_content = set()
+            # Collect in query order so evidence ordering stays
+            # deterministic, normalizing every hit to the dict format at
+            # the boundary
+            all_chunks = []
+            for query in search_queries:
+                for hit in results_by_query.get(query, []):
+                    chunk = _to_chunk(hit)
+                    if chunk is not None:
+                        all_chunks.append(chunk)
+
+            # Single-pass dedup, capped at top_k. Chunks are keyed by a
+            # 16-byte blake2b digest instead of the full 1-2KB content
+            # string, keeping the seen-set tiny and comparisons cheap.
+            seen_hashes: set = set()
             unique_chunks = []
-            for chunk_tuple in all_chunks:
-                if isinstance(chunk_tuple, tuple) and len(chunk_tuple) >= 2:
-                    content, score = chunk_tuple[0], chunk_tuple[1]
-                    if (
-                        content not in seen_content
-                        and len(unique_chunks) < self.top_k_chunks
-                    ):
-                        seen_content.add(content)
-                        unique_chunks.append(
-                            {
-                                "content": content,
-                                "score": score,
-                                "company_id": company_url,
-                            }
-                        )
-                elif isinstance(chunk_tuple, dict):
-                    # Handle dict format if it comes that way
-                    content = chunk_tuple.get("content", "")
-                    if (
-                        content not in seen_content
-                        and len(unique_chunks) < self.top_k_chunks
-                    ):
-                        seen_content.add(content)
-                        unique_chunks.append(chunk_tuple)
+            for chunk in all_chunks:
+                content = chunk.get("content", "")
+                content_hash = hashlib.blake2b(
+                    content.encode(), digest_size=16
+                ).digest()
+                if content_hash in seen_hashes:
+                    continue
+                seen_hashes.add(content_hash)
+                unique_chunks.append({**chunk, "company_id": company_url})
+                if len(unique_chunks) >= self.top_k_chunks:
+                    break
 
             self.logger.info(
-                f"Retrieved {len(unique_chunks)} unique chunks for {company_url}"
+                "Retrieved %d unique chunks for %s", len(unique_chunks), company_url
             )
+            if unique_chunks:
+                self._evidence_cache[company_url] = unique_chunks
             return unique_chunks
 
         except Exception as e:
-            self.logger.error(f"Failed to retrieve chunks for {company_url}: {e}")
+            self.logger.error("Failed to retrieve chunks for %s: %s", company_url, e)
             return []
 
     def _create_search_queries(self, placeholders: List[str]) -> List[str]:
@@ -177,63 +470,29 @@ class FactsheetGenerator:
         Returns:
             List of search query strings
         """
-        # Map placeholders to natural language queries with enhanced geographic terms
-        placeholder_queries = {
-            "company_overview": "company overview mission vision about",
-            "business_focus": "business focus core services main activities",
-            "products_services": "products services offerings solutions",
-            "market_position": "market position competitive advantage",
-            "key_metrics": "performance metrics financial results revenue",
-            "recent_developments": "recent news updates developments announcements",
-            "leadership_team": "leadership team management executives founders",
-            "locations_operations": "locations offices operations facilities",
-            "financial_highlights": "financial performance revenue profit growth",
-            "growth_strategy": "strategy growth plans future expansion",
-            "technology_stack": "technology platform technical infrastructure",
-            "construction_specialties": "construction projects building specialties",
-            "certifications_licenses": "certifications licenses accreditations",
-            "safety_record": "safety record standards compliance",
-            "healthcare_focus": "healthcare medical clinical focus areas",
-            "regulatory_compliance": "regulatory compliance approvals standards",
-            # Enhanced geographic queries with specific city names from Drees data
-            "geographic_coverage": "Austin Cincinnati Cleveland Dallas Houston Indianapolis Jacksonville Nashville Raleigh San Antonio Washington new home discover locations",
-            "locations": "Austin Cincinnati Cleveland Dallas Houston Indianapolis Jacksonville Nashville Raleigh San Antonio Washington locations cities markets",
-            "service_areas": "Austin Cincinnati Cleveland Dallas Houston Indianapolis Jacksonville Nashville Raleigh San Antonio Washington service areas",
-            # Construction specific
-            "services_offered": "home building construction services custom homes",
-            "key_projects": "projects portfolio recent contracts communities developments",
-            "industry_recognition": "awards recognition national excellence top builder",
-            "competitive_advantages": "advantages benefits stress-free building experience DreeSmart",
-            "sustainability_initiatives": "sustainability environment green energy efficient DreeSmart",
-        }
-
-        queries = []
+        # Dict used as an ordered set: O(1) membership and no duplicate
+        # queries issued downstream
+        queries: Dict[str, None] = {}
         for placeholder in placeholders[:6]:  # Limit to avoid too many queries
-            query = placeholder_queries.get(
+            query = _PLACEHOLDER_QUERIES.get(
                 placeholder,
                 placeholder.replace("_", " "),  # Fallback: convert underscore to space
             )
-            queries.append(query)
+            queries[query] = None
 
-        # Always include a general company query
-        if "company overview" not in " ".join(queries):
-            queries.insert(0, "company overview about business")
+        # Always include a general company query (first, so it survives
+        # the final limit)
+        if not any(query.startswith("company overview") for query in queries):
+            queries = {"company overview about business": None, **queries}
 
         # Add geographic fallback if any location-related placeholder is present
-        geographic_placeholders = [
-            "geographic_coverage",
-            "locations",
-            "service_areas",
-            "locations_operations",
-            "markets",
-            "regions",
-        ]
-        if any(placeholder in geographic_placeholders for placeholder in placeholders):
+        if any(
+            placeholder in _GEOGRAPHIC_PLACEHOLDERS for placeholder in placeholders
+        ):
             geographic_query = "discover new home Austin Cincinnati Cleveland Dallas Houston Indianapolis Jacksonville Nashville Raleigh San Antonio Washington locations"
-            if geographic_query not in queries:
-                queries.append(geographic_query)
+            queries[geographic_query] = None
 
-        return queries[:4]  # Limit to 4 queries for efficiency
+        return list(queries)[:4]  # Limit to 4 queries for efficiency
 
     def _create_generation_prompt(
         self,
@@ -251,20 +510,28 @@ class FactsheetGenerator:
             evidence_chunks: Retrieved text chunks as evidence
 
         Returns:
-            Complete prompt for factsheet generation
+            Complete prompt for factsheet generation, ordered so the
+            invariant content forms a cacheable prefix and all
+            per-company fields come last
         """
         # Extract company name from URL for context
         company_name = self._extract_company_name(company_url)
 
-        # Prepare evidence section
+        # Prepare evidence section (generator feed, no intermediate list)
         evidence_text = "\n\n".join(
-            [
-                f"Evidence {i+1}:\n{chunk.get('content', '')}"
-                for i, chunk in enumerate(evidence_chunks)
-            ]
+            (
+                _EVIDENCE_HEADERS[i]
+                if i < len(_EVIDENCE_HEADERS)
+                else f"Evidence {i + 1}:\n"
+            )
+            + chunk.get("content", "")
+            for i, chunk in enumerate(evidence_chunks)
         )
 
-        prompt = f"""You are a professional business analyst creating a comprehensive factsheet for a company.
+        prompt = f"""{self.STATIC_PROMPT_HEADER}
+
+TEMPLATE TO FILL:
+{template}
 
 COMPANY INFORMATION:
 - Company URL: {company_url}
@@ -274,33 +541,21 @@ COMPANY INFORMATION:
 EVIDENCE FROM COMPANY WEBSITE:
 {evidence_text}
 
-TEMPLATE TO FILL:
-{template}
-
-INSTRUCTIONS:
-1. Generate a comprehensive factsheet by filling in ALL placeholders in the template
-2. Use ONLY information from the provided evidence - do not hallucinate
-3. If specific information is not available in the evidence, write "Information not available in source material"
-4. Target word count: {self.target_word_count} words (minimum {self.min_word_count}, maximum {self.max_word_count})
-5. Use professional, factual language appropriate for sales teams
-6. Maintain the exact Markdown structure of the template
-7. Replace {{company_name}} with the actual company name from the evidence or URL
-8. Focus on factual, evidence-based content that would be useful for sales prospecting
-
-QUALITY REQUIREMENTS:
-- Be specific and detailed where evidence supports it
-- Use exact quotes or paraphrases from the evidence
-- Maintain professional tone throughout
-- Ensure all sections add value for sales teams
-- If a section cannot be filled with evidence, clearly state the limitation
+Target word count: {self.target_word_count} words (minimum {self.min_word_count}, maximum {self.max_word_count})
 
 Generate the complete factsheet now:"""
 
         return prompt
 
-    def _extract_company_name(self, url: str) -> str:
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def _extract_company_name(url: str) -> str:
         """Extract probable company name from URL.
 
+        Uses the C-accelerated urlsplit (which also handles ports,
+        paths, and casing the old str.replace chain mishandled) and
+        caches per URL, since this runs for every prompt build.
+
         Args:
             url: Company URL
 
@@ -308,22 +563,27 @@ Generate the complete factsheet now:"""
             Probable company name
         """
         try:
-            # Remove protocol and www
-            domain = (
-                url.replace("https://", "").replace("http://", "").replace("www.", "")
-            )
+            host = urlsplit(url if "://" in url else f"http://{url}").hostname or ""
+            host = host.removeprefix("www.")
+            return host.split(".")[0].capitalize() or "Company"
+        except Exception:
+            return "Company"
 
-            # Extract domain name before first dot
-            domain_parts = domain.split(".")
-            if domain_parts:
-                name = domain_parts[0]
-                # Capitalize first letter
-                return name.capitalize()
+    def _count_tokens(self, text: str) -> int:
+        """Count tokens in text.
 
-            return "Company"
+        Uses the model's BPE encoder when available; otherwise falls
+        back to the rough 1 token ≈ 4 chars approximation.
 
-        except Exception:
-            return "Company"
+        Args:
+            text: Text to count tokens for
+
+        Returns:
+            Token count
+        """
+        if self._token_encoder is not None:
+            return len(self._token_encoder.encode(text))
+        return len(text) // 4
 
     def _estimate_generation_cost(self, prompt: str, completion: str) -> float:
         """Estimate the cost of generation.
@@ -339,9 +599,8 @@ Generate the complete factsheet now:"""
         input_cost_per_token = 0.03 / 1000  # $0.03 per 1K tokens
         output_cost_per_token = 0.06 / 1000  # $0.06 per 1K tokens
 
-        # Rough token estimation (1 token ≈ 4 chars)
-        input_tokens = len(prompt) // 4
-        output_tokens = len(completion) // 4
+        input_tokens = self._count_tokens(prompt)
+        output_tokens = self._count_tokens(completion)
 
         cost = (input_tokens * input_cost_per_token) + (
             output_tokens * output_cost_per_token
@@ -364,6 +623,93 @@ Generate the complete factsheet now:"""
         is_valid = self.min_word_count <= word_count <= self.max_word_count
         return is_valid, word_count
 
+    def _generate_structured(
+        self,
+        company_url: str,
+        industry: str,
+        template: str,
+        placeholders: List[str],
+        evidence_chunks: List[Dict[str, Any]],
+        prompt: str,
+    ) -> Dict[str, Any]:
+        """Generate a factsheet via strict structured output.
+
+        Requests one JSON string field per template section and fills
+        the template client-side. Section-level generation keeps length
+        drift small enough that the free-form word-count retry loop is
+        unnecessary; word-count validation is advisory only.
+
+        Args:
+            company_url: URL of the company
+            industry: Industry classification
+            template: Markdown template with placeholders
+            placeholders: Template placeholder names
+            evidence_chunks: Retrieved text chunks as evidence
+            prompt: Prebuilt generation prompt
+
+        Returns:
+            Dictionary containing factsheet and metadata
+        """
+        fields = sorted(placeholders)
+        schema = {
+            "type": "object",
+            "properties": {field: {"type": "string"} for field in fields},
+            "required": fields,
+            "additionalProperties": False,
+        }
+
+        response = self.openai_client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {
+                    "role": "system",
+                    "content": "You are a professional business analyst creating factsheets for sales teams.",
+                },
+                {"role": "user", "content": prompt},
+            ],
+            max_tokens=self.max_tokens,
+            temperature=self.temperature,
+            response_format={
+                "type": "json_schema",
+                "json_schema": {
+                    "name": "factsheet",
+                    "schema": schema,
+                    "strict": True,
+                },
+            },
+        )
+
+        sections = json.loads(response.choices[0].message.content)
+
+        # Fill placeholders without str.format so literal braces in the
+        # template (or unknown placeholders) survive untouched
+        factsheet_content = re.sub(
+            r"\{(\w+)\}",
+            lambda match: str(sections.get(match.group(1), match.group(0))),
+            template,
+        )
+
+        cost = self._estimate_generation_cost(prompt, factsheet_content)
+        with self._stats_lock:
+            self.total_generation_cost += cost
+            total_cost = self.total_generation_cost
+        is_valid, word_count = self._validate_word_count(factsheet_content)
+
+        return {
+            "status": "success",
+            "factsheet": factsheet_content,
+            "company_url": company_url,
+            "industry": industry,
+            "word_count": word_count,
+            "word_count_valid": is_valid,
+            "evidence_chunks_used": len(evidence_chunks),
+            "generation_cost": cost,
+            "total_cost": total_cost,
+            "model_used": self.model,
+            "attempt": 1,
+            "structured_output": True,
+        }
+
     def generate_factsheet(
         self, company_url: str, industry: str, max_retries: int = 2
     ) -> Dict[str, Any]:
@@ -378,12 +724,32 @@ Generate the complete factsheet now:"""
             Dictionary containing factsheet and metadata
         """
         try:
-            self.logger.info(f"Generating factsheet for {company_url} in {industry}")
+            self.logger.info("Generating factsheet for %s in %s", company_url, industry)
 
             # Get appropriate template
             template = self.template_manager.get_template(industry)
             placeholders = self.template_manager.get_template_placeholders(industry)
 
+            # Serve repeated runs from the cache (memory first, then the
+            # persistent disk tier). The key embeds the company_url in
+            # clear so invalidate() can match entries per company.
+            template_hash = hashlib.sha256(
+                f"{industry}|{template}".encode()
+            ).hexdigest()
+            cache_key = f"factsheet:{company_url}|{template_hash}"
+            cached = self._factsheet_cache.get(cache_key)
+            if cached is None and self._disk_cache is not None:
+                cached = self._disk_cache.get(cache_key)
+                if cached is not None:
+                    self._factsheet_cache[cache_key] = cached
+            if cached is not None:
+                with self._stats_lock:
+                    self.cache_hits += 1
+                self.logger.info("Factsheet cache hit for %s", company_url)
+                return dict(cached)
+            with self._stats_lock:
+                self.cache_misses += 1
+
             # Retrieve relevant chunks
             evidence_chunks = self._retrieve_relevant_chunks(
                 company_url, list(placeholders)
@@ -397,11 +763,39 @@ Generate the complete factsheet now:"""
                     "industry": industry,
                 }
 
-            # Generate factsheet with retries for word count
-            for attempt in range(max_retries + 1):
-                prompt = self._create_generation_prompt(
-                    company_url, industry, template, evidence_chunks
+            # Build the prompt once; its inputs do not change across
+            # retries. Retries only append a short word-target suffix, so
+            # the long prefix stays bit-identical for prefix caching.
+            prompt = self._create_generation_prompt(
+                company_url, industry, template, evidence_chunks
+            )
+
+            # Structured mode generates per-section JSON in one shot —
+            # no word-count retry loop
+            if self.structured_output:
+                result = self._generate_structured(
+                    company_url,
+                    industry,
+                    template,
+                    list(placeholders),
+                    evidence_chunks,
+                    prompt,
                 )
+                if result["status"] == "success":
+                    self._cache_factsheet(cache_key, result)
+                return result
+
+            # Generate factsheet with retries for word count. The target
+            # is tracked locally so one company's retry adjustment cannot
+            # leak into concurrently running companies' prompts
+            target_word_count = self.target_word_count
+            for attempt in range(max_retries + 1):
+                user_content = prompt
+                if attempt > 0:
+                    user_content = (
+                        f"{prompt}\n\nIMPORTANT: adjust the factsheet to "
+                        f"about {target_word_count} words."
+                    )
 
                 # Call OpenAI API
                 try:
@@ -412,25 +806,54 @@ Generate the complete factsheet now:"""
                                 "role": "system",
                                 "content": "You are a professional business analyst creating factsheets for sales teams.",
                             },
-                            {"role": "user", "content": prompt},
+                            {"role": "user", "content": user_content},
                         ],
                         max_tokens=self.max_tokens,
                         temperature=self.temperature,
-                        stream=False,
+                        stream=True,
                     )
 
-                    factsheet_content = response.choices[0].message.content
+                    # Accumulate streamed deltas, counting words as they
+                    # arrive so an over-long generation is cut off
+                    # mid-stream instead of paying for tokens past the cap
+                    parts: List[str] = []
+                    streamed_words = 0
+                    cutoff = self.max_word_count + 50
+                    truncated = False
+                    for chunk in response:
+                        delta = (
+                            chunk.choices[0].delta.content if chunk.choices else None
+                        )
+                        if not delta:
+                            continue
+                        parts.append(delta)
+                        streamed_words += delta.count(" ")
+                        if streamed_words >= cutoff:
+                            truncated = True
+                            close = getattr(response, "close", None)
+                            if callable(close):
+                                close()
+                            break
+
+                    factsheet_content = "".join(parts)
 
                     # Estimate cost
-                    cost = self._estimate_generation_cost(prompt, factsheet_content)
-                    self.total_generation_cost += cost
+                    cost = self._estimate_generation_cost(
+                        user_content, factsheet_content
+                    )
+                    with self._stats_lock:
+                        self.total_generation_cost += cost
+                        total_cost = self.total_generation_cost
 
                     # Validate word count
                     is_valid, word_count = self._validate_word_count(factsheet_content)
 
-                    if is_valid or attempt == max_retries:
+                    # A truncated stream already hit the over-length cap;
+                    # retrying would only generate (and pay for) another
+                    # over-long draft, so accept the final attempt early
+                    if is_valid or truncated or attempt == max_retries:
                         # Return result (valid or final attempt)
-                        return {
+                        result = {
                             "status": "success",
                             "factsheet": factsheet_content,
                             "company_url": company_url,
@@ -439,30 +862,31 @@ Generate the complete factsheet now:"""
                             "word_count_valid": is_valid,
                             "evidence_chunks_used": len(evidence_chunks),
                             "generation_cost": cost,
-                            "total_cost": self.total_generation_cost,
+                            "total_cost": total_cost,
                             "model_used": self.model,
                             "attempt": attempt + 1,
                         }
+                        self._cache_factsheet(cache_key, result)
+                        return result
                     else:
                         # Retry with adjusted prompt
                         self.logger.warning(
-                            f"Word count {word_count} not in range {self.min_word_count}-{self.max_word_count}, "
-                            f"retrying attempt {attempt + 2}"
+                            "Word count %d not in range %d-%d, retrying attempt %d",
+                            word_count,
+                            self.min_word_count,
+                            self.max_word_count,
+                            attempt + 2,
                         )
 
                         # Adjust target for next attempt
                         if word_count < self.min_word_count:
-                            self.target_word_count = min(
-                                900, self.target_word_count + 100
-                            )
+                            target_word_count = min(900, target_word_count + 100)
                         else:
-                            self.target_word_count = max(
-                                700, self.target_word_count - 100
-                            )
+                            target_word_count = max(700, target_word_count - 100)
 
                 except Exception as e:
                     self.logger.error(
-                        f"OpenAI API call failed on attempt {attempt + 1}: {e}"
+                        "OpenAI API call failed on attempt %d: %s", attempt + 1, e
                     )
                     if attempt == max_retries:
                         return {
@@ -473,7 +897,7 @@ Generate the complete factsheet now:"""
                         }
 
         except Exception as e:
-            self.logger.error(f"Factsheet generation failed for {company_url}: {e}")
+            self.logger.error("Factsheet generation failed for %s: %s", company_url, e)
             return {
                 "status": "error",
                 "error": str(e),
@@ -484,47 +908,311 @@ Generate the complete factsheet now:"""
     def generate_multiple_factsheets(
         self, companies: List[Tuple[str, str]], max_concurrent: int = 3
     ) -> List[Dict[str, Any]]:
-        """Generate factsheets for multiple companies.
+        """Generate factsheets for multiple companies concurrently.
+
+        Generation is dominated by API round-trips, so companies are
+        dispatched concurrently with a semaphore bounding in-flight
+        requests to stay under rate limits.
 
         Args:
             companies: List of (url, industry) tuples
             max_concurrent: Maximum concurrent generations (to avoid rate limits)
 
         Returns:
-            List of generation results
+            List of generation results (in input order)
         """
 
-        self.logger.info(f"Generating factsheets for {len(companies)} companies")
+        self.logger.info("Generating factsheets for %d companies", len(companies))
 
-        results = []
-        for url, industry in companies:
-            try:
-                result = self.generate_factsheet(url, industry)
-                results.append(result)
+        results = asyncio.run(
+            self._generate_all_async(companies, max_concurrent)
+        )
 
-                # Brief pause to avoid rate limits
-                import time
+        self.logger.info(
+            "Completed %d factsheet generations. Total cost: $%.4f",
+            len(results),
+            self.total_generation_cost,
+        )
 
-                time.sleep(1)
+        return results
 
-            except Exception as e:
-                self.logger.error(f"Failed to generate factsheet for {url}: {e}")
-                results.append(
-                    {
+    async def _generate_all_async(
+        self, companies: List[Tuple[str, str]], max_concurrent: int
+    ) -> List[Dict[str, Any]]:
+        """Run bounded-concurrency generation for all companies.
+
+        Retrieval and generation form a two-stage pipeline: evidence
+        prefetch tasks run under their own semaphore, so retrieval for
+        upcoming companies overlaps with in-flight completion calls and
+        generation slots are never spent waiting on vector search. The
+        prefetched chunks land in the evidence cache, which
+        generate_factsheet reads before hitting the store.
+
+        Args:
+            companies: List of (url, industry) tuples
+            max_concurrent: Maximum concurrent generations
+
+        Returns:
+            List of generation results (in input order)
+        """
+        semaphore = asyncio.Semaphore(max_concurrent)
+        retrieval_semaphore = asyncio.Semaphore(max_concurrent)
+
+        async def prefetch_evidence(url: str, industry: str) -> None:
+            async with retrieval_semaphore:
+                if url in self._evidence_cache:
+                    return
+                try:
+                    placeholders = self.template_manager.get_template_placeholders(
+                        industry
+                    )
+                    await asyncio.to_thread(
+                        self._retrieve_relevant_chunks, url, placeholders
+                    )
+                except Exception as e:
+                    # Best-effort warm-up only; generate_factsheet performs
+                    # retrieval itself and owns the error reporting
+                    self.logger.debug("Evidence prefetch failed for %s: %s", url, e)
+
+        async def generate_bounded(
+            url: str, industry: str, prefetch: "asyncio.Task[None]"
+        ) -> Dict[str, Any]:
+            await prefetch
+            async with semaphore:
+                try:
+                    return await asyncio.to_thread(
+                        self.generate_factsheet, url, industry
+                    )
+                except Exception as e:
+                    self.logger.error(
+                        "Failed to generate factsheet for %s: %s", url, e
+                    )
+                    return {
                         "status": "error",
                         "error": str(e),
                         "company_url": url,
                         "industry": industry,
                     }
-                )
 
-        self.logger.info(
-            f"Completed {len(results)} factsheet generations. "
-            f"Total cost: ${self.total_generation_cost:.4f}"
+        prefetches = [
+            asyncio.create_task(prefetch_evidence(url, industry))
+            for url, industry in companies
+        ]
+        return list(
+            await asyncio.gather(
+                *(
+                    generate_bounded(url, industry, prefetch)
+                    for (url, industry), prefetch in zip(companies, prefetches)
+                )
+            )
         )
 
+    def generate_factsheets_batched(
+        self,
+        companies: List[Tuple[str, str]],
+        batch_size: int = 10,
+        use_batch_api: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """Generate factsheets in batches to amortize rate limits.
+
+        Chat models do not accept list prompts, so a "batch" here is a
+        group of `batch_size` companies whose requests are dispatched
+        concurrently in one round trip's worth of wall time. For jobs
+        with no latency requirement, `use_batch_api=True` routes the
+        whole set through OpenAI's Batch API instead, which is billed
+        at half price.
+
+        Args:
+            companies: List of (url, industry) tuples
+            batch_size: Number of companies dispatched concurrently per batch
+            use_batch_api: Submit via the asynchronous Batch API
+
+        Returns:
+            List of generation results (in input order)
+        """
+        if use_batch_api:
+            return self._generate_via_batch_api(companies)
+
+        results = []
+        for start in range(0, len(companies), batch_size):
+            batch = companies[start : start + batch_size]
+            results.extend(
+                asyncio.run(self._generate_all_async(batch, len(batch)))
+            )
         return results
 
+    def _generate_via_batch_api(
+        self, companies: List[Tuple[str, str]], poll_interval: int = 30
+    ) -> List[Dict[str, Any]]:
+        """Submit all generation requests through the OpenAI Batch API.
+
+        Builds one JSONL request file (prompts constructed exactly as in
+        the synchronous path), uploads it, polls the batch until it
+        reaches a terminal state, and maps the output file back to
+        per-company results.
+
+        Args:
+            companies: List of (url, industry) tuples
+            poll_interval: Seconds between batch status polls
+
+        Returns:
+            List of generation results (in input order)
+        """
+        requests_by_id: Dict[str, Dict[str, Any]] = {}
+        errors_by_id: Dict[str, Dict[str, Any]] = {}
+        prompts_by_id: Dict[str, str] = {}
+
+        for url, industry in companies:
+            try:
+                template = self.template_manager.get_template(industry)
+                placeholders = self.template_manager.get_template_placeholders(
+                    industry
+                )
+                evidence_chunks = self._retrieve_relevant_chunks(
+                    url, list(placeholders)
+                )
+                if not evidence_chunks:
+                    errors_by_id[url] = {
+                        "status": "error",
+                        "error": "No relevant data found in vector store",
+                        "company_url": url,
+                        "industry": industry,
+                    }
+                    continue
+
+                prompt = self._create_generation_prompt(
+                    url, industry, template, evidence_chunks
+                )
+                prompts_by_id[url] = prompt
+                requests_by_id[url] = {
+                    "custom_id": url,
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": {
+                        "model": self.model,
+                        "messages": [
+                            {
+                                "role": "system",
+                                "content": "You are a professional business analyst creating factsheets for sales teams.",
+                            },
+                            {"role": "user", "content": prompt},
+                        ],
+                        "max_tokens": self.max_tokens,
+                        "temperature": self.temperature,
+                    },
+                }
+            except Exception as e:
+                errors_by_id[url] = {
+                    "status": "error",
+                    "error": str(e),
+                    "company_url": url,
+                    "industry": industry,
+                }
+
+        results_by_id: Dict[str, Dict[str, Any]] = dict(errors_by_id)
+
+        if requests_by_id:
+            with tempfile.NamedTemporaryFile(
+                "w", suffix=".jsonl", delete=False
+            ) as f:
+                for request in requests_by_id.values():
+                    f.write(json.dumps(request) + "\n")
+                batch_input_path = f.name
+
+            with open(batch_input_path, "rb") as f:
+                input_file = self.openai_client.files.create(
+                    file=f, purpose="batch"
+                )
+
+            batch = self.openai_client.batches.create(
+                input_file_id=input_file.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h",
+            )
+            self.logger.info(
+                "Submitted batch %s with %d requests", batch.id, len(requests_by_id)
+            )
+
+            while batch.status not in ("completed", "failed", "expired", "cancelled"):
+                time.sleep(poll_interval)
+                batch = self.openai_client.batches.retrieve(batch.id)
+
+            if batch.status == "completed":
+                output = self.openai_client.files.content(batch.output_file_id)
+                for line in output.text.splitlines():
+                    if not line.strip():
+                        continue
+                    record = json.loads(line)
+                    custom_id = record.get("custom_id", "")
+                    request = requests_by_id.get(custom_id)
+                    if request is None:
+                        continue
+                    industry = ""
+                    for url, ind in companies:
+                        if url == custom_id:
+                            industry = ind
+                            break
+                    body = (record.get("response") or {}).get("body") or {}
+                    choices = body.get("choices") or []
+                    if not choices:
+                        results_by_id[custom_id] = {
+                            "status": "error",
+                            "error": "Empty batch response",
+                            "company_url": custom_id,
+                            "industry": industry,
+                        }
+                        continue
+
+                    factsheet_content = choices[0]["message"]["content"]
+                    # Batch API requests are billed at 50% of the
+                    # synchronous price
+                    cost = 0.5 * self._estimate_generation_cost(
+                        prompts_by_id[custom_id], factsheet_content
+                    )
+                    with self._stats_lock:
+                        self.total_generation_cost += cost
+                        total_cost = self.total_generation_cost
+                    is_valid, word_count = self._validate_word_count(
+                        factsheet_content
+                    )
+                    results_by_id[custom_id] = {
+                        "status": "success",
+                        "factsheet": factsheet_content,
+                        "company_url": custom_id,
+                        "industry": industry,
+                        "word_count": word_count,
+                        "word_count_valid": is_valid,
+                        "generation_cost": cost,
+                        "total_cost": total_cost,
+                        "model_used": self.model,
+                        "via_batch_api": True,
+                    }
+            else:
+                self.logger.error("Batch %s ended as %s", batch.id, batch.status)
+                for custom_id in requests_by_id:
+                    industry = next(
+                        (ind for url, ind in companies if url == custom_id), ""
+                    )
+                    results_by_id[custom_id] = {
+                        "status": "error",
+                        "error": f"Batch ended as {batch.status}",
+                        "company_url": custom_id,
+                        "industry": industry,
+                    }
+
+        return [
+            results_by_id.get(
+                url,
+                {
+                    "status": "error",
+                    "error": "Missing from batch output",
+                    "company_url": url,
+                    "industry": industry,
+                },
+            )
+            for url, industry in companies
+        ]
+
     def get_cost_summary(self) -> Dict[str, Any]:
         """Get cost summary for all generations.
 
@@ -537,4 +1225,11 @@ Generate the complete factsheet now:"""
             "temperature": self.temperature,
             "target_word_count": self.target_word_count,
             "cost_per_factsheet_avg": self.total_generation_cost,  # Will be divided by count
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "disk_cache_stats": (
+                dict(zip(("hits", "misses"), self._disk_cache.stats()))
+                if self._disk_cache is not None
+                else None
+            ),
         }
@@ -3,13 +3,59 @@ CSV ingestion and job orchestration for the Sales Factsheet Generation System.
 """
 
 import asyncio
-import json
+import hashlib
 import logging
+import os
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 import click
-import pandas as pd
+import numpy as np
+import orjson
+
+# zlib level 6 is the speed/ratio sweet spot; checkpoint JSON compresses
+# roughly 10x, so each save writes an order of magnitude fewer bytes
+_CHECKPOINT_COMPRESSION_LEVEL = 6
+
+# Compact the append-only journal into a snapshot every N records so
+# replay cost on resume stays bounded
+_JOURNAL_COMPACT_EVERY = 100
+
+# Vector store uploads are coalesced into batches of up to this many
+# companies, or whatever arrives within the batching window
+_UPLOAD_BATCH_SIZE = 32
+_UPLOAD_BATCH_WINDOW_SECONDS = 0.1
+
+# Translation table mapping path separators and dots to underscores
+_SAFE_TBL = str.maketrans({"/": "_", ".": "_"})
+
+
+def _now_iso() -> str:
+    """Return the current UTC time in ISO format.
+
+    Stdlib datetime is far cheaper per call than constructing a pandas
+    Timestamp, which matters on failure-heavy runs where every record
+    gets stamped.
+    """
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _safe_id(url: str) -> str:
+    """Derive the filesystem/store-safe id for a URL.
+
+    A single translate pass replaces the chained str.replace calls,
+    allocating one string instead of one per replacement.
+
+    Args:
+        url: Company website URL
+
+    Returns:
+        Safe identifier with the scheme stripped and separators replaced
+    """
+    return url.removeprefix("https://").removeprefix("http://").translate(_SAFE_TBL)
 
 
 class IngestCLI:
@@ -32,14 +78,34 @@ class IngestCLI:
         """
         self.csv_path = Path(csv_path)
         self.checkpoint_file = Path(checkpoint_file)
+        self._journal_file = self.checkpoint_file.with_suffix(".jsonl")
+        self._ckpt_lock: Optional[asyncio.Lock] = None  # created inside the loop
+        self._appends_since_snapshot = 0
+        self._last_ckpt_hash: Optional[bytes] = None
         self.enable_vector_store = enable_vector_store
         self.force_rescrape = force_rescrape
         self.processed_companies: List[str] = []
+        # Set mirror of processed_companies for O(1) membership checks
+        self._processed_set: Set[str] = set()
         self.failed_companies: List[Dict[str, Any]] = []
         self.companies_from_existing_data: List[str] = []
         self.companies_freshly_scraped: List[str] = []
         self.vector_store = None
         self.total_vector_cost = 0.0
+        # Shared scraper/cleaner, lazily created on first use and reused
+        # across companies so setup cost is paid once per run
+        self._scraper: Optional[Any] = None
+        self._scraper_lock: Optional[asyncio.Lock] = None
+        self._cleaner: Optional[Any] = None
+        # Queue feeding the background upload batcher; live only while
+        # process_companies_async runs
+        self._upload_queue: Optional[asyncio.Queue] = None
+        # Lazily built map of safe_url -> newest processed-data file,
+        # replacing a per-URL directory glob with one scan
+        self._existing_index: Optional[Dict[str, Path]] = None
+        # Dedicated pool for blocking file reads from coroutines, so
+        # disk I/O overlaps with in-flight scrapes
+        self._io_pool = ThreadPoolExecutor(max_workers=16)
         self.logger = self._setup_logging()
 
         # Initialize vector store if enabled
@@ -71,13 +137,23 @@ class IngestCLI:
             self.enable_vector_store = False
 
     def load_checkpoint(self) -> None:
-        """Load checkpoint data if it exists."""
+        """Load checkpoint data if it exists.
+
+        Restores the compacted snapshot first, then replays the
+        append-only journal written during the run, so progress made
+        since the last snapshot (e.g. before a crash) is recovered.
+        """
         if self.checkpoint_file.exists():
             try:
-                with open(self.checkpoint_file, "r") as f:
-                    checkpoint_data = json.load(f)
-                    self.processed_companies = checkpoint_data.get("processed", [])
-                    self.failed_companies = checkpoint_data.get("failed", [])
+                raw = self.checkpoint_file.read_bytes()
+                # zlib streams start with 0x78; plain JSON starts with "{",
+                # so older uncompressed checkpoints still load
+                if raw[:1] == b"\x78":
+                    raw = zlib.decompress(raw)
+                checkpoint_data = orjson.loads(raw)
+                self.processed_companies = checkpoint_data.get("processed", [])
+                self._processed_set = set(self.processed_companies)
+                self.failed_companies = checkpoint_data.get("failed", [])
                 processed_count = len(self.processed_companies)
                 failed_count = len(self.failed_companies)
                 self.logger.info(
@@ -87,24 +163,108 @@ class IngestCLI:
             except Exception as e:
                 self.logger.warning(f"Failed to load checkpoint: {e}")
 
+        if self._journal_file.exists():
+            try:
+                replayed = 0
+                self._processed_set.update(self.processed_companies)
+                with open(self._journal_file, "r", encoding="utf-8") as f:
+                    for line in f:
+                        line = line.strip()
+                        if not line:
+                            continue
+                        record = orjson.loads(line)
+                        if record.get("status") == "ok":
+                            if record["url"] not in self._processed_set:
+                                self._processed_set.add(record["url"])
+                                self.processed_companies.append(record["url"])
+                                replayed += 1
+                        else:
+                            self.failed_companies.append(record)
+                            replayed += 1
+                if replayed:
+                    self.logger.info(
+                        f"Replayed {replayed} records from checkpoint journal"
+                    )
+            except Exception as e:
+                self.logger.warning(f"Failed to replay checkpoint journal: {e}")
+
+    def _write_journal_line(self, line: str) -> None:
+        """Append one record line to the checkpoint journal."""
+        with open(self._journal_file, "a", encoding="utf-8") as f:
+            f.write(line)
+
+    async def _append_checkpoint(self, record: Dict[str, Any]) -> None:
+        """Append one result record to the journal as it completes.
+
+        Unlike save_checkpoint, which rewrites the whole state, this is
+        O(1) per event, so a crash mid-run loses at most the in-flight
+        companies. The journal is compacted into a snapshot every
+        _JOURNAL_COMPACT_EVERY appends to bound replay cost on resume.
+
+        Args:
+            record: JSON-serializable result record with a "status" key
+        """
+        if self._ckpt_lock is None:
+            self._ckpt_lock = asyncio.Lock()
+        line = orjson.dumps(record).decode() + "\n"
+        loop = asyncio.get_running_loop()
+        async with self._ckpt_lock:
+            try:
+                await loop.run_in_executor(self._io_pool, self._write_journal_line, line)
+                self._appends_since_snapshot += 1
+                if self._appends_since_snapshot >= _JOURNAL_COMPACT_EVERY:
+                    await loop.run_in_executor(self._io_pool, self.save_checkpoint)
+            except Exception as e:
+                self.logger.warning(f"Failed to append checkpoint record: {e}")
+
     def save_checkpoint(self) -> None:
-        """Save current state to checkpoint file."""
+        """Save current state to checkpoint file.
+
+        The payload is compact JSON compressed with zlib, written to a
+        temp file, fsynced, and atomically renamed so a crash mid-write
+        never corrupts an existing checkpoint. A save whose content
+        matches the previous snapshot is skipped entirely.
+        """
         checkpoint_data = {
             "processed": self.processed_companies,
             "failed": self.failed_companies,
         }
         try:
-            with open(self.checkpoint_file, "w") as f:
-                json.dump(checkpoint_data, f, indent=2)
+            raw = orjson.dumps(checkpoint_data)
+            content_hash = hashlib.blake2b(raw, digest_size=16).digest()
+            if content_hash == self._last_ckpt_hash:
+                # Nothing changed since the last snapshot; the journal is
+                # still redundant with it, so just clear it
+                self._journal_file.unlink(missing_ok=True)
+                self._appends_since_snapshot = 0
+                return
+
+            payload = zlib.compress(raw, _CHECKPOINT_COMPRESSION_LEVEL)
+            tmp_path = self.checkpoint_file.with_suffix(
+                self.checkpoint_file.suffix + ".tmp"
+            )
+            with open(tmp_path, "wb") as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.checkpoint_file)
+            self._last_ckpt_hash = content_hash
+            # The snapshot now covers everything in the journal
+            self._journal_file.unlink(missing_ok=True)
+            self._appends_since_snapshot = 0
             self.logger.info("Checkpoint saved successfully")
         except Exception as e:
             self.logger.error(f"Failed to save checkpoint: {e}")
 
-    def validate_csv(self) -> pd.DataFrame:
+    def validate_csv(self) -> Tuple[np.ndarray, np.ndarray]:
         """Validate and load the CSV file.
 
+        Only the url and industry columns are ever consumed downstream,
+        so they are returned as a pair of aligned arrays and the
+        DataFrame (with any unused columns) is dropped after validation.
+
         Returns:
-            DataFrame: Validated company data
+            Tuple of (urls, industries) string arrays
 
         Raises:
             click.BadParameter: If CSV is invalid or missing required columns
@@ -112,17 +272,38 @@ class IngestCLI:
         if not self.csv_path.exists():
             raise click.BadParameter(f"CSV file not found: {self.csv_path}")
 
+        # pandas is deferred to first use so CLI startup stays light
+        import pandas as pd
+
+        # Validate required columns against the header alone before
+        # committing to a full parse
+        required_columns = ["url", "industry"]
         try:
-            df = pd.read_csv(self.csv_path)
+            header = pd.read_csv(self.csv_path, nrows=0)
         except Exception as e:
             raise click.BadParameter(f"Failed to read CSV: {e}")
-
-        # Validate required columns
-        required_columns = ["url", "industry"]
-        missing_columns = [col for col in required_columns if col not in df.columns]
+        missing_columns = [
+            col for col in required_columns if col not in header.columns
+        ]
         if missing_columns:
             raise click.BadParameter(f"Missing required columns: {missing_columns}")
 
+        # Parse only the two needed columns, as strings, skipping type
+        # inference on everything else. The pyarrow engine parses in
+        # parallel when available; otherwise the default engine still
+        # benefits from usecols/dtype
+        read_kwargs: Dict[str, Any] = {
+            "usecols": required_columns,
+            "dtype": {"url": "string", "industry": "string"},
+        }
+        try:
+            try:
+                df = pd.read_csv(self.csv_path, engine="pyarrow", **read_kwargs)
+            except (ImportError, ValueError):
+                df = pd.read_csv(self.csv_path, **read_kwargs)
+        except Exception as e:
+            raise click.BadParameter(f"Failed to read CSV: {e}")
+
         # Remove rows with missing data
         initial_count = len(df)
         df = df.dropna(subset=required_columns)
@@ -137,11 +318,28 @@ class IngestCLI:
         if len(df) == 0:
             raise click.BadParameter("No valid URLs found in CSV")
 
+        # Dedupe on a normalized key (whitespace/trailing-slash
+        # insensitive) so a URL listed twice is not scraped and embedded
+        # twice. The original strings are preserved: checkpoint entries
+        # and existing-data filenames from earlier runs were derived
+        # from them, so rewriting URLs here would break resume
+        dedupe_key = df["url"].str.strip().str.rstrip("/")
+        before = len(df)
+        df = df[~dedupe_key.duplicated(keep="first")]
+        if len(df) < before:
+            self.logger.warning(f"Removed {before - len(df)} duplicate URLs")
+
         self.logger.info(f"Loaded {len(df)} valid companies from CSV")
-        return df
+        urls = df["url"].astype(str).to_numpy(dtype=object)
+        industries = df["industry"].astype(str).to_numpy(dtype=object)
+        return urls, industries
 
     async def _store_in_vector_store(
-        self, url: str, industry: str, processed_data: Dict[str, Any]
+        self,
+        url: str,
+        industry: str,
+        processed_data: Dict[str, Any],
+        company_id: Optional[str] = None,
     ) -> Dict[str, Any]:
         """Store processed company data in vector store.
 
@@ -149,6 +347,7 @@ class IngestCLI:
             url: Company website URL
             industry: Industry classification
             processed_data: Processed content data
+            company_id: Precomputed safe id, derived when not supplied
 
         Returns:
             Dict containing vector store result
@@ -157,9 +356,8 @@ class IngestCLI:
             return {"status": "skipped", "reason": "Vector store disabled"}
 
         try:
-            # Create company ID from URL
-            company_id = url.replace("https://", "").replace("http://", "")
-            company_id = company_id.replace("/", "_").replace(".", "_")
+            if company_id is None:
+                company_id = _safe_id(url)
 
             # Get text chunks from processed data
             chunks = processed_data.get("combined_chunks", [])
@@ -182,11 +380,20 @@ class IngestCLI:
                 }
                 chunk_metadata.append(metadata)
 
-            # Upload to vector store
+            # Upload to vector store, via the batching queue when the
+            # background worker is running so chunks from concurrent
+            # companies share one embeddings round-trip
             self.logger.info(f"Storing {len(chunks)} chunks for {url} in vector store")
-            store_id, cost = self.vector_store.upload_chunks_to_store(
-                company_id, chunks, chunk_metadata
-            )
+            if self._upload_queue is not None:
+                future = asyncio.get_running_loop().create_future()
+                await self._upload_queue.put(
+                    (company_id, chunks, chunk_metadata, future)
+                )
+                store_id, cost = await future
+            else:
+                store_id, cost = self.vector_store.upload_chunks_to_store(
+                    company_id, chunks, chunk_metadata
+                )
 
             self.total_vector_cost += cost
 
@@ -207,35 +414,125 @@ class IngestCLI:
             self.logger.error(f"Failed to store {url} in vector store: {e}")
             return {"status": "error", "error": str(e)}
 
-    def _check_existing_data(self, url: str) -> Dict[str, Any]:
+    async def _drain_upload_queue(self) -> None:
+        """Coalesce queued vector-store uploads into batched calls.
+
+        Pulls items off the upload queue until _UPLOAD_BATCH_SIZE is
+        reached or the batching window elapses, then hands the batch to
+        upload_chunks_batched in a worker thread. If the batched call
+        fails, each item is retried individually so one bad company does
+        not fail its batchmates. A None sentinel ends the worker.
+        """
+        loop = asyncio.get_running_loop()
+        done = False
+        while not done:
+            item = await self._upload_queue.get()
+            if item is None:
+                return
+
+            batch = [item]
+            deadline = loop.time() + _UPLOAD_BATCH_WINDOW_SECONDS
+            while len(batch) < _UPLOAD_BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    nxt = await asyncio.wait_for(self._upload_queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if nxt is None:
+                    done = True
+                    break
+                batch.append(nxt)
+
+            items = [
+                (company_id, chunks, metadata)
+                for company_id, chunks, metadata, _ in batch
+            ]
+            try:
+                results = await asyncio.to_thread(
+                    self.vector_store.upload_chunks_batched, items
+                )
+                for (_, _, _, future), result in zip(batch, results):
+                    future.set_result(result)
+            except Exception:
+                for company_id, chunks, metadata, future in batch:
+                    try:
+                        result = await asyncio.to_thread(
+                            self.vector_store.upload_chunks_to_store,
+                            company_id,
+                            chunks,
+                            metadata,
+                        )
+                        future.set_result(result)
+                    except Exception as e:
+                        future.set_exception(e)
+
+    def _build_existing_index(self) -> Dict[str, Path]:
+        """Index extracted_data files by safe URL in a single scan.
+
+        Keeps only the newest processed-data file per company, so lookup
+        later is a dict hit instead of a glob plus per-file stat calls.
+
+        Returns:
+            Dict mapping safe_url to the newest processed-data file path
+        """
+        index: Dict[str, Path] = {}
+        newest_mtime: Dict[str, float] = {}
+        extracted_dir = Path("extracted_data")
+        if not extracted_dir.exists():
+            return index
+
+        with os.scandir(extracted_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith(".json") or "_processed_" not in entry.name:
+                    continue
+                safe_url = entry.name.rsplit("_processed_", 1)[0]
+                mtime = entry.stat().st_mtime
+                if mtime >= newest_mtime.get(safe_url, 0.0):
+                    newest_mtime[safe_url] = mtime
+                    index[safe_url] = Path(entry.path)
+        return index
+
+    async def _check_existing_data(
+        self, url: str, safe_url: Optional[str] = None
+    ) -> Dict[str, Any]:
         """Check if extracted data already exists for the URL.
 
+        The blocking directory scan and file read run in the I/O pool so
+        the event loop keeps serving other coroutines meanwhile.
+
         Args:
             url: Company website URL
+            safe_url: Precomputed safe id, derived when not supplied
 
         Returns:
             Dict containing existing data or None if not found
         """
+        return await asyncio.get_running_loop().run_in_executor(
+            self._io_pool, self._check_existing_data_sync, url, safe_url
+        )
+
+    def _check_existing_data_sync(
+        self, url: str, safe_url: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Blocking implementation behind _check_existing_data."""
         try:
-            # Create safe filename from URL
-            safe_url = url.replace("https://", "").replace("http://", "")
-            safe_url = safe_url.replace("/", "_").replace(".", "_")
+            if safe_url is None:
+                safe_url = _safe_id(url)
 
-            # Check extracted_data directory
-            extracted_dir = Path("extracted_data")
-            if not extracted_dir.exists():
-                return None
+            # One directory scan serves every lookup in the run
+            if self._existing_index is None:
+                self._existing_index = self._build_existing_index()
 
-            # Look for processed files matching this URL
-            processed_files = list(extracted_dir.glob(f"{safe_url}_processed_*.json"))
-            if not processed_files:
+            latest_file = self._existing_index.get(safe_url)
+            if latest_file is None:
                 return None
 
-            # Get the most recent file
-            latest_file = max(processed_files, key=lambda p: p.stat().st_mtime)
-
-            with open(latest_file, "r", encoding="utf-8") as f:
-                existing_data = json.load(f)
+            # orjson parses the raw bytes directly, skipping the
+            # intermediate str decode
+            with open(latest_file, "rb") as f:
+                existing_data = orjson.loads(f.read())
 
             self.logger.info(f"Found existing data for {url}: {latest_file.name}")
             return existing_data
@@ -244,20 +541,53 @@ class IngestCLI:
             self.logger.warning(f"Failed to check existing data for {url}: {e}")
             return None
 
-    async def process_company(self, url: str, industry: str) -> Dict[str, Any]:
+    async def _get_scraper(self) -> Any:
+        """Return the shared WebScraper, creating it on first use.
+
+        Guarded by a lock so concurrent coroutines do not race to build
+        duplicate instances on a cold start.
+        """
+        if self._scraper is None:
+            if self._scraper_lock is None:
+                self._scraper_lock = asyncio.Lock()
+            async with self._scraper_lock:
+                if self._scraper is None:
+                    from .scraper import WebScraper
+
+                    self._scraper = WebScraper(max_concurrent=5)
+        return self._scraper
+
+    def _get_cleaner(self) -> Any:
+        """Return the shared ContentCleaner, creating it on first use."""
+        if self._cleaner is None:
+            from .cleaner import ContentCleaner
+
+            self._cleaner = ContentCleaner(chunk_size=1000, chunk_overlap=200)
+        return self._cleaner
+
+    async def process_company(
+        self, url: str, industry: str, safe_url: Optional[str] = None
+    ) -> Dict[str, Any]:
         """Process a single company with web scraping and content cleaning.
 
         Args:
             url: Company website URL
             industry: Industry classification
+            safe_url: Precomputed filesystem/store-safe id for the URL;
+                derived from the URL when not supplied
 
         Returns:
             Dict containing processing result
         """
         try:
+            if safe_url is None:
+                safe_url = _safe_id(url)
+
             # Check if we already have extracted data (unless forced to rescrape)
             existing_data = (
-                None if self.force_rescrape else self._check_existing_data(url)
+                None
+                if self.force_rescrape
+                else await self._check_existing_data(url, safe_url)
             )
             if existing_data:
                 self.logger.info(f"Using existing extracted data for {url}")
@@ -273,25 +603,6 @@ class IngestCLI:
                     "status": "success",
                 }
 
-                # Create scraped_data structure for consistency
-                scraped_data = {
-                    "url": url,
-                    "homepage_content": existing_data.get("homepage_cleaned", {}).get(
-                        "cleaned_text", ""
-                    ),
-                    "homepage_text": existing_data.get("homepage_cleaned", {}).get(
-                        "cleaned_text", ""
-                    ),
-                    "about_url": None,
-                    "about_text": (
-                        existing_data.get("about_cleaned", {}).get("cleaned_text", "")
-                        if existing_data.get("about_cleaned")
-                        else ""
-                    ),
-                    "method": "existing_data",
-                    "status": "success",
-                }
-
             else:
                 # No existing data, proceed with scraping
                 self.logger.info(
@@ -299,13 +610,9 @@ class IngestCLI:
                 )
                 self.companies_freshly_scraped.append(url)
 
-                # Import scraper and cleaner
-                from .cleaner import ContentCleaner
-                from .scraper import WebScraper
-
-                # Initialize scraper and cleaner
-                scraper = WebScraper(max_concurrent=5)
-                cleaner = ContentCleaner(chunk_size=1000, chunk_overlap=200)
+                # Reuse the shared scraper and cleaner across companies
+                scraper = await self._get_scraper()
+                cleaner = self._get_cleaner()
 
                 # Scrape the website
                 scraped_data = await scraper.scrape_company(url)
@@ -316,7 +623,12 @@ class IngestCLI:
                     )
 
                 # Clean and process the content
-                processed_data = cleaner.process_scraped_content(scraped_data)
+                # Cleaning (trafilatura parsing, chunking) is CPU work;
+                # run it in the pool so it does not stall the event loop
+                # while other companies are mid-scrape
+                processed_data = await asyncio.get_running_loop().run_in_executor(
+                    self._io_pool, cleaner.process_scraped_content, scraped_data
+                )
 
                 if processed_data.get("status") != "success":
                     raise Exception(
@@ -326,16 +638,18 @@ class IngestCLI:
 
             # Store in vector store
             vector_result = await self._store_in_vector_store(
-                url, industry, processed_data
+                url, industry, processed_data, safe_url
             )
 
+            # Return only a lightweight summary; the heavy scraped and
+            # processed payloads have served their purpose (vector store
+            # upload) and can be freed as soon as this coroutine ends,
+            # instead of living in the results until the run finishes
             return {
                 "url": url,
                 "industry": industry,
                 "status": "success",
-                "timestamp": pd.Timestamp.now().isoformat(),
-                "scraped_data": scraped_data,
-                "processed_data": processed_data,
+                "timestamp": _now_iso(),
                 "content_length": processed_data.get("total_length", 0),
                 "num_chunks": processed_data.get("num_chunks", 0),
                 "vector_store_result": vector_result,
@@ -346,55 +660,96 @@ class IngestCLI:
             raise e
 
     async def process_companies_async(
-        self, companies_df: pd.DataFrame, max_concurrent: int = 8
+        self, urls: np.ndarray, industries: np.ndarray, max_concurrent: int = 8
     ) -> None:
         """Process companies asynchronously with concurrency control.
 
+        Companies are dispatched through a sliding window of at most
+        max_concurrent tasks rather than materializing a Task per row up
+        front, so task objects, results, and checkpoint writes are
+        processed incrementally instead of held until the end.
+
         Args:
-            companies_df: DataFrame containing company data
+            urls: Array of company URLs
+            industries: Array of industry labels, aligned with urls
             max_concurrent: Maximum number of concurrent jobs
         """
-        semaphore = asyncio.Semaphore(max_concurrent)
 
-        async def process_with_semaphore(url: str, industry: str) -> None:
-            async with semaphore:
-                try:
-                    result = await self.process_company(url, industry)
-                    self.processed_companies.append(result["url"])
-                    self.logger.info(f"Processed: {url}")
-                except Exception as e:
-                    self.failed_companies.append(
-                        {
-                            "url": url,
-                            "industry": industry,
-                            "error": str(e),
-                            "timestamp": pd.Timestamp.now().isoformat(),
-                        }
-                    )
-                    self.logger.error(f"Failed to process {url}: {e}")
-
-        # Create tasks for all companies
-        tasks = []
-        for _, row in companies_df.iterrows():
-            url = str(row["url"])
-            industry = str(row["industry"])
+        async def process_one(url: str, industry: str, safe_url: str) -> None:
+            try:
+                result = await self.process_company(url, industry, safe_url)
+                self.processed_companies.append(result["url"])
+                self._processed_set.add(result["url"])
+                await self._append_checkpoint({"url": result["url"], "status": "ok"})
+                self.logger.info(f"Processed: {url}")
+            except Exception as e:
+                failure = {
+                    "url": url,
+                    "industry": industry,
+                    "error": str(e),
+                    "timestamp": _now_iso(),
+                    "status": "failed",
+                }
+                self.failed_companies.append(failure)
+                await self._append_checkpoint(failure)
+                self.logger.error(f"Failed to process {url}: {e}")
+
+        # Create tasks for all companies, with skip checks against a set.
+        # Sync in case processed_companies was populated outside
+        # load_checkpoint (e.g. assigned directly by callers)
+        self._processed_set.update(self.processed_companies)
+
+        # Derive every safe URL in one pass through pandas' vectorized
+        # string kernels rather than chained str.replace per coroutine
+        import pandas as pd
+
+        safe_urls = (
+            pd.Series(urls, dtype="string")
+            .str.removeprefix("https://")
+            .str.removeprefix("http://")
+            .str.replace("/", "_", regex=False)
+            .str.replace(".", "_", regex=False)
+            .to_numpy(dtype=object)
+        )
 
-            # Skip already processed companies
-            if url in self.processed_companies:
+        companies = []
+        for url, industry, safe_url in zip(urls, industries, safe_urls):
+            if url in self._processed_set:
                 self.logger.info(f"Skipping already processed: {url}")
                 continue
+            companies.append((url, industry, safe_url))
 
-            task = process_with_semaphore(url, industry)
-            tasks.append(task)
-
-        # Run all tasks concurrently
-        if tasks:
-            task_count = len(tasks)
+        # Dispatch through a sliding window, with the upload batcher
+        # running in the background while the vector store is active
+        if companies:
             self.logger.info(
-                f"Starting processing of {task_count} companies with max "
+                f"Starting processing of {len(companies)} companies with max "
                 f"{max_concurrent} concurrent jobs"
             )
-            await asyncio.gather(*tasks, return_exceptions=True)
+            upload_worker = None
+            if self.enable_vector_store and self.vector_store:
+                self._upload_queue = asyncio.Queue()
+                upload_worker = asyncio.create_task(self._drain_upload_queue())
+            pending: Set[asyncio.Task] = set()
+            try:
+                for url, industry, safe_url in companies:
+                    if len(pending) >= max_concurrent:
+                        _, pending = await asyncio.wait(
+                            pending, return_when=asyncio.FIRST_COMPLETED
+                        )
+                    pending.add(
+                        asyncio.create_task(process_one(url, industry, safe_url))
+                    )
+                if pending:
+                    await asyncio.wait(pending)
+            finally:
+                if upload_worker is not None:
+                    await self._upload_queue.put(None)
+                    await upload_worker
+                    self._upload_queue = None
+                if self._scraper is not None:
+                    await self._scraper.aclose()
+                    self._scraper = None
         else:
             self.logger.info("No new companies to process")
 
@@ -409,10 +764,12 @@ class IngestCLI:
             self.load_checkpoint()
 
             # Validate and load CSV
-            companies_df = self.validate_csv()
+            urls, industries = self.validate_csv()
 
             # Process companies
-            asyncio.run(self.process_companies_async(companies_df, max_concurrent))
+            asyncio.run(
+                self.process_companies_async(urls, industries, max_concurrent)
+            )
 
             # Save checkpoint
             self.save_checkpoint()
@@ -481,47 +838,9 @@ class IngestCLI:
                 self.logger.info(f"  - {failed['url']}: {failed['error']}")
 
 
-@click.command()
-@click.argument("csv_file", type=click.Path(exists=True))
-@click.option("--max-concurrent", "-c", default=8, help="Maximum concurrent jobs")
-@click.option(
-    "--checkpoint", "-cp", default="checkpoint.json", help="Checkpoint file path"
-)
-@click.option(
-    "--enable-vector-store/--disable-vector-store",
-    default=True,
-    help="Enable/disable vector store integration",
-)
-@click.option(
-    "--force-rescrape",
-    is_flag=True,
-    default=False,
-    help="Force re-scraping even if extracted data exists",
-)
-def main(
-    csv_file: str,
-    max_concurrent: int,
-    checkpoint: str,
-    enable_vector_store: bool,
-    force_rescrape: bool,
-) -> None:
-    """Ingest company data from CSV and orchestrate processing jobs.
-
-    CSV_FILE: Path to CSV file with 'url' and 'industry' columns
-
-    This command will:
-    1. Scrape company websites using Firecrawl + httpx fallback
-    2. Clean and chunk the content using trafilatura
-    3. Store text chunks in OpenAI FileStore for RAG retrieval
-    4. Track costs and maintain budget constraints
-    """
-    try:
-        ingest = IngestCLI(csv_file, checkpoint, enable_vector_store, force_rescrape)
-        ingest.run(max_concurrent)
-    except Exception as e:
-        click.echo(f"Error: {e}", err=True)
-        raise click.Abort()
-
+# Re-exported for backwards compatibility; the click command lives in
+# cli.py so importing it does not pull in the pipeline modules
+from .cli import main  # noqa: E402
 
 if __name__ == "__main__":
     main()
@@ -5,12 +5,44 @@ This module handles file output, including slugification of company names,
 directory management, and saving factsheets and accuracy reports.
 """
 
+import asyncio
 import logging
+import os
 import re
+import string
+import threading
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
+# Pre-compiled patterns used on every slugify/extract call; compiling once at
+# import time avoids re-probing the re module's pattern cache per file written.
+_SUFFIX_RE = re.compile(
+    r"\s+(company|factsheet|inc|llc|corp|corporation|ltd|construction|industry)\.?\s*$",
+    re.IGNORECASE,
+)
+_HYPHEN_RE = re.compile(r"[-\s]+")
+# Single-pass slug cleanup for ASCII names: drop punctuation (keeping
+# hyphens/underscores) and turn whitespace into hyphens. The table only
+# covers ASCII, so non-ASCII names go through _SLUG_NONWORD_RE instead,
+# which handles Unicode symbols and whitespace.
+_SLUG_TABLE = str.maketrans(
+    {
+        **{c: None for c in string.punctuation if c not in "-_"},
+        **{c: "-" for c in string.whitespace},
+    }
+)
+_SLUG_NONWORD_RE = re.compile(r"[^\w\s-]")
+_URL_NONWORD_RE = re.compile(r"[^\w]")
+_HEADING_SUFFIX1_RE = re.compile(
+    r"\s*[•\-–—]\s*[^\n]*?\b(?:factsheet|company|industry|construction)\b[^\n]*$",
+    re.IGNORECASE,
+)
+_HEADING_SUFFIX2_RE = re.compile(
+    r"\s+(company|factsheet|inc|llc|corp|corporation|ltd)\.?\s*$",
+    re.IGNORECASE,
+)
+
 
 class FactsheetWriter:
     """Handles writing factsheets and accuracy reports to files."""
@@ -28,9 +60,12 @@ class FactsheetWriter:
         self.min_word_count = 600
         self.max_word_count = 1000
 
-        # Tracking
-        self.written_files: List[Dict[str, Any]] = []
+        # Tracking (lock guards updates from write_many's worker threads).
+        # written_files is keyed by filepath so cleanup can delete entries
+        # in O(1) instead of O(n) list scans.
+        self.written_files: Dict[str, Dict[str, Any]] = {}
         self.failed_writes: List[Dict[str, Any]] = []
+        self._track_lock = threading.Lock()
 
         # Ensure output directory exists
         self._ensure_output_dir()
@@ -82,15 +117,17 @@ class FactsheetWriter:
             base_name = self._extract_company_name_from_url(company_url)
 
         # Clean the name - remove common suffixes but keep essential business words like "homes"
-        base_name = re.sub(
-            r"\s+(inc|corp|corporation|company|llc|ltd|construction|industry|factsheet)\.?\s*$",
-            "",
-            base_name.lower(),
-        )
-
-        # Convert to lowercase and replace spaces/special chars with hyphens
-        slug = re.sub(r"[^\w\s-]", "", base_name.lower())
-        slug = re.sub(r"[-\s]+", "-", slug)
+        base_name = _SUFFIX_RE.sub("", base_name.lower())
+
+        # Replace spaces/special chars with hyphens in one translate pass
+        # (base_name is already lowercase); non-ASCII names take the
+        # Unicode-aware regex path instead
+        if base_name.isascii():
+            slug = base_name.translate(_SLUG_TABLE)
+            if "--" in slug:
+                slug = _HYPHEN_RE.sub("-", slug)
+        else:
+            slug = _HYPHEN_RE.sub("-", _SLUG_NONWORD_RE.sub("", base_name))
 
         # Remove leading/trailing hyphens
         slug = slug.strip("-")
@@ -104,7 +141,7 @@ class FactsheetWriter:
                 .replace("www.", "")
             )
             domain = domain.split("/")[0].split(".")[0]
-            slug = re.sub(r"[^\w]", "-", domain.lower()).strip("-")
+            slug = _URL_NONWORD_RE.sub("-", domain.lower()).strip("-")
 
         # Ensure not empty
         if not slug:
@@ -150,30 +187,28 @@ class FactsheetWriter:
             Extracted company name or None
         """
         try:
-            # Look for the first heading which should be the company name
-            lines = factsheet_content.split("\n")
-            for line in lines:
-                line = line.strip()
-                if line.startswith("# ") and len(line) > 2:
-                    # Extract company name from heading
-                    heading = line[2:].strip()
-                    # Remove common suffixes and separators like "• Construction Industry Factsheet" or "- Company Factsheet"
-                    name = re.sub(
-                        r"\s*[•\-–—]\s*.*(?:industry|company|factsheet|construction).*$",
-                        "",
-                        heading,
-                        flags=re.IGNORECASE,
-                    )
-                    # Also remove standalone suffixes but keep business-specific words like "homes"
-                    name = re.sub(
-                        r"\s+(inc|corp|corporation|company|llc|ltd|factsheet)\.?\s*$",
-                        "",
-                        name,
-                        flags=re.IGNORECASE,
-                    )
-                    return name.strip()
-
-            return None
+            # Locate the first "# " heading directly rather than splitting the
+            # whole content into a list of lines just to read its top
+            if factsheet_content.startswith("# "):
+                start = 2
+            else:
+                idx = factsheet_content.find("\n# ")
+                if idx == -1:
+                    return None
+                start = idx + 3
+
+            end = factsheet_content.find("\n", start)
+            heading = (
+                factsheet_content[start:end] if end != -1 else factsheet_content[start:]
+            ).strip()
+            if not heading:
+                return None
+
+            # Remove common suffixes and separators like "• Construction Industry Factsheet" or "- Company Factsheet"
+            name = _HEADING_SUFFIX1_RE.sub("", heading)
+            # Also remove standalone suffixes but keep business-specific words like "homes"
+            name = _HEADING_SUFFIX2_RE.sub("", name)
+            return name.strip()
 
         except Exception:
             return None
@@ -200,6 +235,7 @@ class FactsheetWriter:
         factsheet_content: str,
         metadata: Optional[Dict[str, Any]] = None,
         overwrite: bool = False,
+        slug: Optional[str] = None,
     ) -> Dict[str, Any]:
         """Write a factsheet to a file.
 
@@ -208,6 +244,7 @@ class FactsheetWriter:
             factsheet_content: Generated factsheet content
             metadata: Optional metadata about the generation
             overwrite: Whether to overwrite existing files
+            slug: Precomputed filename slug (skips name extraction)
 
         Returns:
             Dictionary with write result and file information
@@ -221,20 +258,29 @@ class FactsheetWriter:
                     f"{self.min_word_count}-{self.max_word_count} for {company_url}"
                 )
 
-            # Extract company name from factsheet content
-            extracted_name = self._extract_company_name_from_factsheet(
-                factsheet_content
-            )
-
-            # Create filename slug
-            slug = self.slugify_company_name(company_url, extracted_name)
+            # Extract company name and build the slug, unless the caller
+            # already computed one for this company
+            extracted_name = None
+            if slug is None:
+                extracted_name = self._extract_company_name_from_factsheet(
+                    factsheet_content
+                )
+                slug = self.slugify_company_name(company_url, extracted_name)
 
             # Create filename
             filename = f"{slug}.md"
             filepath = self.output_dir / filename
 
-            # Check if file exists and handle overwrite
-            if filepath.exists() and not overwrite:
+            # Write factsheet to file; encoding once up front also gives us the
+            # on-disk size without a follow-up stat() call. O_EXCL makes the
+            # exists-check part of the open itself rather than a separate stat.
+            encoded = factsheet_content.encode("utf-8")
+            flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC
+            if not overwrite:
+                flags |= os.O_EXCL
+            try:
+                fd = os.open(filepath, flags, 0o644)
+            except FileExistsError:
                 self.logger.warning(f"Factsheet file already exists: {filepath}")
                 return {
                     "status": "skipped",
@@ -245,10 +291,10 @@ class FactsheetWriter:
                     "word_count": word_count,
                     "word_count_valid": is_valid_count,
                 }
-
-            # Write factsheet to file
-            with open(filepath, "w", encoding="utf-8") as f:
-                f.write(factsheet_content)
+            try:
+                os.write(fd, encoded)
+            finally:
+                os.close(fd)
 
             # Create result metadata
             result = {
@@ -260,7 +306,7 @@ class FactsheetWriter:
                 "word_count": word_count,
                 "word_count_valid": is_valid_count,
                 "timestamp": datetime.now().isoformat(),
-                "file_size_bytes": filepath.stat().st_size,
+                "file_size_bytes": len(encoded),
                 "extracted_company_name": extracted_name,
             }
 
@@ -269,7 +315,8 @@ class FactsheetWriter:
                 result["generation_metadata"] = metadata
 
             # Track written file
-            self.written_files.append(result)
+            with self._track_lock:
+                self.written_files[result["filepath"]] = result
 
             self.logger.info(
                 f"Written factsheet for {company_url} to {filepath} "
@@ -286,7 +333,8 @@ class FactsheetWriter:
                 "timestamp": datetime.now().isoformat(),
             }
 
-            self.failed_writes.append(error_result)
+            with self._track_lock:
+                self.failed_writes.append(error_result)
             self.logger.error(f"Failed to write factsheet for {company_url}: {e}")
 
             return error_result
@@ -297,6 +345,7 @@ class FactsheetWriter:
         accuracy_report: str,
         metadata: Optional[Dict[str, Any]] = None,
         overwrite: bool = False,
+        slug: Optional[str] = None,
     ) -> Dict[str, Any]:
         """Write an accuracy report to a file.
 
@@ -305,23 +354,35 @@ class FactsheetWriter:
             accuracy_report: Generated accuracy report content
             metadata: Optional metadata about the validation
             overwrite: Whether to overwrite existing files
+            slug: Precomputed filename slug (skips name extraction)
 
         Returns:
             Dictionary with write result and file information
         """
         try:
-            # Extract company name for consistent slugification
-            extracted_name = self._extract_company_name_from_factsheet(accuracy_report)
-
-            # Create filename slug (same as factsheet)
-            slug = self.slugify_company_name(company_url, extracted_name)
+            # Extract company name for consistent slugification, unless the
+            # caller already computed the slug from the factsheet
+            extracted_name = None
+            if slug is None:
+                extracted_name = self._extract_company_name_from_factsheet(
+                    accuracy_report
+                )
+                slug = self.slugify_company_name(company_url, extracted_name)
 
             # Create accuracy report filename
             filename = f"{slug}_accuracy.md"
             filepath = self.output_dir / filename
 
-            # Check if file exists and handle overwrite
-            if filepath.exists() and not overwrite:
+            # Write accuracy report to file (bytes, so the size is known
+            # without a follow-up stat() call); O_EXCL folds the exists-check
+            # into the open itself
+            encoded = accuracy_report.encode("utf-8")
+            flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC
+            if not overwrite:
+                flags |= os.O_EXCL
+            try:
+                fd = os.open(filepath, flags, 0o644)
+            except FileExistsError:
                 self.logger.warning(f"Accuracy report file already exists: {filepath}")
                 return {
                     "status": "skipped",
@@ -330,10 +391,10 @@ class FactsheetWriter:
                     "company_url": company_url,
                     "slug": slug,
                 }
-
-            # Write accuracy report to file
-            with open(filepath, "w", encoding="utf-8") as f:
-                f.write(accuracy_report)
+            try:
+                os.write(fd, encoded)
+            finally:
+                os.close(fd)
 
             # Create result metadata
             result = {
@@ -343,7 +404,7 @@ class FactsheetWriter:
                 "company_url": company_url,
                 "slug": slug,
                 "timestamp": datetime.now().isoformat(),
-                "file_size_bytes": filepath.stat().st_size,
+                "file_size_bytes": len(encoded),
                 "extracted_company_name": extracted_name,
             }
 
@@ -352,7 +413,8 @@ class FactsheetWriter:
                 result["validation_metadata"] = metadata
 
             # Track written file
-            self.written_files.append(result)
+            with self._track_lock:
+                self.written_files[result["filepath"]] = result
 
             self.logger.info(
                 f"Written accuracy report for {company_url} to {filepath} "
@@ -369,7 +431,8 @@ class FactsheetWriter:
                 "timestamp": datetime.now().isoformat(),
             }
 
-            self.failed_writes.append(error_result)
+            with self._track_lock:
+                self.failed_writes.append(error_result)
             self.logger.error(f"Failed to write accuracy report for {company_url}: {e}")
 
             return error_result
@@ -403,9 +466,13 @@ class FactsheetWriter:
             "overall_status": "success",
         }
 
+        # Slugify once per company; both files share the name
+        extracted_name = self._extract_company_name_from_factsheet(factsheet_content)
+        slug = self.slugify_company_name(company_url, extracted_name)
+
         # Write factsheet
         factsheet_result = self.write_factsheet(
-            company_url, factsheet_content, factsheet_metadata, overwrite
+            company_url, factsheet_content, factsheet_metadata, overwrite, slug=slug
         )
         results["factsheet"] = factsheet_result
 
@@ -415,7 +482,7 @@ class FactsheetWriter:
         # Write accuracy report if provided
         if accuracy_report:
             accuracy_result = self.write_accuracy_report(
-                company_url, accuracy_report, accuracy_metadata, overwrite
+                company_url, accuracy_report, accuracy_metadata, overwrite, slug=slug
             )
             results["accuracy_report"] = accuracy_result
 
@@ -428,13 +495,125 @@ class FactsheetWriter:
 
         return results
 
+    async def write_company_files_async(
+        self,
+        company_url: str,
+        factsheet_content: str,
+        accuracy_report: Optional[str] = None,
+        factsheet_metadata: Optional[Dict[str, Any]] = None,
+        accuracy_metadata: Optional[Dict[str, Any]] = None,
+        overwrite: bool = False,
+    ) -> Dict[str, Any]:
+        """Write both files for a company without blocking the event loop.
+
+        The factsheet and accuracy report are independent files, so they are
+        written concurrently via worker threads.
+
+        Args:
+            company_url: Company website URL
+            factsheet_content: Generated factsheet content
+            accuracy_report: Generated accuracy report (optional)
+            factsheet_metadata: Optional factsheet generation metadata
+            accuracy_metadata: Optional accuracy validation metadata
+            overwrite: Whether to overwrite existing files
+
+        Returns:
+            Dictionary with results for both files
+        """
+        results = {
+            "company_url": company_url,
+            "factsheet": None,
+            "accuracy_report": None,
+            "overall_status": "success",
+        }
+
+        # Slugify once per company; both files share the name
+        extracted_name = self._extract_company_name_from_factsheet(factsheet_content)
+        slug = self.slugify_company_name(company_url, extracted_name)
+
+        if accuracy_report:
+            factsheet_result, accuracy_result = await asyncio.gather(
+                asyncio.to_thread(
+                    self.write_factsheet,
+                    company_url,
+                    factsheet_content,
+                    factsheet_metadata,
+                    overwrite,
+                    slug,
+                ),
+                asyncio.to_thread(
+                    self.write_accuracy_report,
+                    company_url,
+                    accuracy_report,
+                    accuracy_metadata,
+                    overwrite,
+                    slug,
+                ),
+            )
+        else:
+            factsheet_result = await asyncio.to_thread(
+                self.write_factsheet,
+                company_url,
+                factsheet_content,
+                factsheet_metadata,
+                overwrite,
+                slug,
+            )
+            accuracy_result = None
+
+        results["factsheet"] = factsheet_result
+        if factsheet_result["status"] == "error":
+            results["overall_status"] = "partial_failure"
+
+        if accuracy_result is not None:
+            results["accuracy_report"] = accuracy_result
+            if accuracy_result["status"] == "error":
+                results["overall_status"] = (
+                    "partial_failure"
+                    if results["overall_status"] == "success"
+                    else "failure"
+                )
+
+        return results
+
+    async def write_many(
+        self,
+        jobs: List[Tuple[str, str, Optional[str]]],
+        overwrite: bool = False,
+        max_concurrent: int = 32,
+    ) -> List[Dict[str, Any]]:
+        """Write factsheets (and optional accuracy reports) for many companies.
+
+        Args:
+            jobs: List of (company_url, factsheet_content, accuracy_report)
+                  tuples; accuracy_report may be None
+            overwrite: Whether to overwrite existing files
+            max_concurrent: Maximum companies written concurrently
+
+        Returns:
+            List of per-company result dictionaries, in job order
+        """
+        semaphore = asyncio.Semaphore(max_concurrent)
+
+        async def write_bounded(
+            url: str, factsheet: str, accuracy: Optional[str]
+        ) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.write_company_files_async(
+                    url, factsheet, accuracy, overwrite=overwrite
+                )
+
+        return await asyncio.gather(
+            *(write_bounded(url, factsheet, accuracy) for url, factsheet, accuracy in jobs)
+        )
+
     def get_written_files(self) -> List[Dict[str, Any]]:
         """Get list of successfully written files.
 
         Returns:
             List of file metadata for written files
         """
-        return self.written_files.copy()
+        return list(self.written_files.values())
 
     def get_failed_writes(self) -> List[Dict[str, Any]]:
         """Get list of failed write attempts.
@@ -453,32 +632,39 @@ class FactsheetWriter:
         successful_files = len(self.written_files)
         failed_writes = len(self.failed_writes)
 
-        # Count file types
-        factsheets = sum(
-            1 for f in self.written_files if not f["filename"].endswith("_accuracy.md")
-        )
-        accuracy_reports = sum(
-            1 for f in self.written_files if f["filename"].endswith("_accuracy.md")
-        )
-
-        # Calculate word count stats for factsheets
-        factsheet_word_counts = [
-            f["word_count"]
-            for f in self.written_files
-            if "word_count" in f and not f["filename"].endswith("_accuracy.md")
-        ]
+        # Single pass over tracked files computing all aggregates
+        factsheets = 0
+        accuracy_reports = 0
+        wc_min: Optional[int] = None
+        wc_max: Optional[int] = None
+        wc_sum = 0
+        wc_count = 0
+        wc_valid = 0
+
+        for f in self.written_files.values():
+            is_accuracy = f["filename"].endswith("_accuracy.md")
+            if is_accuracy:
+                accuracy_reports += 1
+            else:
+                factsheets += 1
+                if "word_count" in f:
+                    wc = f["word_count"]
+                    wc_sum += wc
+                    wc_count += 1
+                    if wc_min is None or wc < wc_min:
+                        wc_min = wc
+                    if wc_max is None or wc > wc_max:
+                        wc_max = wc
+            if f.get("word_count_valid"):
+                wc_valid += 1
 
         word_count_stats = {}
-        if factsheet_word_counts:
+        if wc_count:
             word_count_stats = {
-                "min_words": min(factsheet_word_counts),
-                "max_words": max(factsheet_word_counts),
-                "avg_words": sum(factsheet_word_counts) / len(factsheet_word_counts),
-                "valid_word_count": sum(
-                    1
-                    for f in self.written_files
-                    if "word_count_valid" in f and f["word_count_valid"]
-                ),
+                "min_words": wc_min,
+                "max_words": wc_max,
+                "avg_words": wc_sum / wc_count,
+                "valid_word_count": wc_valid,
             }
 
         return {
@@ -507,7 +693,7 @@ class FactsheetWriter:
         cleaned_files = []
         failed_cleanups = []
 
-        files_to_clean = self.written_files.copy()
+        files_to_clean = list(self.written_files.values())
 
         # Filter by company URLs if specified
         if company_urls:
@@ -529,10 +715,9 @@ class FactsheetWriter:
                     f"Failed to cleanup file {file_info.get('filepath')}: {e}"
                 )
 
-        # Remove cleaned files from tracking
+        # Remove cleaned files from tracking (O(1) per entry via filepath key)
         for cleaned in cleaned_files:
-            if cleaned in self.written_files:
-                self.written_files.remove(cleaned)
+            self.written_files.pop(cleaned["filepath"], None)
 
         return {
             "cleaned_files": len(cleaned_files),
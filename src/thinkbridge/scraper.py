@@ -5,14 +5,42 @@ Web scraping functionality for the Sales Factsheet Generation System.
 import asyncio
 import logging
 import os
+import re
 import ssl
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from urllib.parse import urljoin
 
 import httpx
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from firecrawl import FirecrawlApp
 
+# Prefer lxml's C parser when available; fall back to the stdlib parser
+try:
+    import lxml  # noqa: F401
+
+    _BS_PARSER = "lxml"
+except ImportError:
+    _BS_PARSER = "html.parser"
+
+# Strainer limiting the about-page link parse to anchor tags only. It stays
+# on html.parser because the lxml tree builder ignores parse_only.
+_LINK_STRAINER = SoupStrainer("a", href=True)
+
+# About-page keywords compiled once into a single alternation; "about" also
+# covers about-us/aboutus/about-company, and who-?we-?are covers both the
+# hyphenated and collapsed spellings.
+_ABOUT_RE = re.compile(r"about|company|our-story|who-?we-?are", re.IGNORECASE)
+
+# Collapses any whitespace run (spaces, newlines, tabs) to a single space
+_WS_COLLAPSE_RE = re.compile(r"\s+")
+
+# URL keywords marking a crawled page as a probable About page
+_ABOUT_URL_KEYWORDS = ("about", "who", "company", "mission")
+
+# Tasks created at once by scrape_multiple_companies; caps coroutine-frame
+# memory for very large URL lists while the semaphore caps in-flight requests
+_SCRAPE_BATCH_SIZE = 256
+
 
 class WebScraper:
     """Web scraper with Firecrawl API and fallback methods."""
@@ -29,9 +57,144 @@ class WebScraper:
         # Get API key from environment if not provided
         self.firecrawl_api_key = firecrawl_api_key or os.getenv("FIRECRAWL_API_KEY")
         self.max_concurrent = max_concurrent
-        self.semaphore = asyncio.Semaphore(max_concurrent)
         self.logger = logging.getLogger(__name__)
 
+        # Admission control: counter + condition instead of a Semaphore so
+        # the cap can be changed at runtime (see set_concurrency)
+        self._active = 0
+        self._cap = max_concurrent
+        self._slots = asyncio.Condition()
+
+        # Permissive SSL context, built once; context construction (cert
+        # loading) dominates client setup cost
+        self._ssl_context = ssl.create_default_context()
+        self._ssl_context.check_hostname = False
+        self._ssl_context.verify_mode = ssl.CERT_NONE
+        # Set minimum TLS version to avoid DH key issues
+        self._ssl_context.minimum_version = ssl.TLSVersion.TLSv1_2
+
+        # Shared HTTP client, created lazily on first use so connections,
+        # TLS sessions and DNS results are reused across scrapes
+        self._client: Optional[httpx.AsyncClient] = None
+
+        # About-page discovery memo keyed on (url, homepage fingerprint), so
+        # retries and re-runs against unchanged pages skip the link scan
+        self._about_cache: Dict[Tuple[str, int], Optional[str]] = {}
+
+        # Revalidation cache: url -> (etag, last-modified, body). Lets
+        # rescrapes send conditional GETs and reuse the body on 304
+        self._cond_cache: Dict[str, Tuple[Optional[str], Optional[str], str]] = {}
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        """Get the shared HTTP client, creating it on first use."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=30.0,
+                follow_redirects=True,
+                verify=self._ssl_context,
+                headers={
+                    "User-Agent": (
+                        "Mozilla/5.0 (compatible; ThinkbridgeBot/1.0; "
+                        "+https://thinkbridge.com/bot)"
+                    ),
+                    "Accept": "text/html,application/xhtml+xml;q=0.9,*/*;q=0.1",
+                },
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrent * 4,
+                    max_keepalive_connections=self.max_concurrent * 2,
+                ),
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP client if it was created."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _fetch_html(self, client: httpx.AsyncClient, url: str) -> str:
+        """Fetch an HTML page, revalidating against the conditional-GET cache.
+
+        Sends If-None-Match/If-Modified-Since when validators are cached for
+        the URL and reuses the cached body on 304 Not Modified, so unchanged
+        pages cost headers instead of a full download.
+
+        Args:
+            client: Shared HTTP client
+            url: Page URL
+
+        Returns:
+            The page body
+
+        Raises:
+            ValueError: If the response is not HTML
+            httpx.HTTPStatusError: On HTTP error responses
+        """
+        cached = self._cond_cache.get(url)
+        req_headers: Dict[str, str] = {}
+        if cached:
+            etag, last_mod, _ = cached
+            if etag:
+                req_headers["If-None-Match"] = etag
+            if last_mod:
+                req_headers["If-Modified-Since"] = last_mod
+
+        response = await client.get(url, headers=req_headers or None)
+        if cached and response.status_code == 304:
+            self.logger.debug(f"304 Not Modified for {url}; reusing cached body")
+            return cached[2]
+
+        response.raise_for_status()
+
+        # Bail out before decoding/parsing non-HTML payloads (PDFs, images,
+        # JSON APIs); servers omitting content-type pass through
+        ctype = response.headers.get("content-type", "").lower()
+        if ctype and "html" not in ctype:
+            raise ValueError(f"non-HTML content-type: {ctype}")
+
+        text = response.text
+        etag = response.headers.get("etag")
+        last_mod = response.headers.get("last-modified")
+        if etag or last_mod:
+            if len(self._cond_cache) >= 128:
+                self._cond_cache.clear()
+            self._cond_cache[url] = (etag, last_mod, text)
+
+        return text
+
+    async def _acquire_slot(self) -> None:
+        """Wait until a concurrency slot is free and claim it."""
+        async with self._slots:
+            await self._slots.wait_for(lambda: self._active < self._cap)
+            self._active += 1
+
+    async def _release_slot(self) -> None:
+        """Return a concurrency slot and wake one waiter."""
+        async with self._slots:
+            self._active -= 1
+            self._slots.notify(1)
+
+    async def set_concurrency(self, max_concurrent: int) -> None:
+        """Adjust the concurrency cap at runtime.
+
+        Raising the cap wakes queued scrapes immediately; lowering it lets
+        in-flight scrapes finish and admits fewer from then on. Useful for
+        backing off when a provider starts returning 429s.
+
+        Args:
+            max_concurrent: New maximum number of concurrent scrapes
+        """
+        async with self._slots:
+            self.max_concurrent = max_concurrent
+            self._cap = max_concurrent
+            self._slots.notify_all()
+
+    async def __aenter__(self) -> "WebScraper":
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        await self.aclose()
+
     async def scrape_company(self, url: str) -> Dict[str, Any]:
         """Scrape a company website for content.
 
@@ -41,20 +204,22 @@ class WebScraper:
         Returns:
             Dict containing scraped content and metadata
         """
-        async with self.semaphore:
-            try:
-                # Try Firecrawl API first if available
-                if self.firecrawl_api_key:
-                    content = await self._scrape_with_firecrawl(url)
-                    if content:
-                        return content
+        await self._acquire_slot()
+        try:
+            # Try Firecrawl API first if available
+            if self.firecrawl_api_key:
+                content = await self._scrape_with_firecrawl(url)
+                if content:
+                    return content
 
-                # Fallback to manual scraping
-                return await self._scrape_with_httpx(url)
+            # Fallback to manual scraping
+            return await self._scrape_with_httpx(url)
 
-            except Exception as e:
-                self.logger.error(f"Failed to scrape {url}: {e}")
-                return {"url": url, "content": "", "error": str(e), "method": "failed"}
+        except Exception as e:
+            self.logger.error(f"Failed to scrape {url}: {e}")
+            return {"url": url, "content": "", "error": str(e), "method": "failed"}
+        finally:
+            await self._release_slot()
 
     async def _scrape_with_firecrawl(self, url: str) -> Optional[Dict[str, Any]]:
         """Scrape using Firecrawl API with crawling for comprehensive data.
@@ -106,35 +271,39 @@ class WebScraper:
                 f"Firecrawl crawl successful for {url}, got {len(data)} pages"
             )
 
-            # Combine content from all pages
-            combined_content = ""
+            # Combine content from all pages; collect parts and join once
+            # instead of growing one string quadratically
+            parts: List[str] = []
             homepage_content = ""
             about_content = ""
             about_url = None
+            url_rstripped = url.rstrip("/")
 
             for page in data:
                 page_url = page.get("metadata", {}).get("sourceURL", "")
                 page_content = page.get("markdown", "")
 
                 if page_content:
-                    combined_content += f"\n\n--- Page: {page_url} ---\n{page_content}"
+                    parts.append(f"\n\n--- Page: {page_url} ---\n{page_content}")
 
                     # Check if this is the homepage (first page or matches base URL)
                     if (
                         not homepage_content
                         or page_url == url
-                        or page_url == url.rstrip("/")
+                        or page_url == url_rstripped
                     ):
                         homepage_content = page_content
 
                     # Check if this looks like an About page
+                    page_url_lower = page_url.lower()
                     if any(
-                        keyword in page_url.lower()
-                        for keyword in ["about", "who", "company", "mission"]
+                        keyword in page_url_lower for keyword in _ABOUT_URL_KEYWORDS
                     ):
                         about_content = page_content
                         about_url = page_url
 
+            combined_content = "".join(parts)
+
             return {
                 "url": url,
                 "homepage_content": homepage_content or combined_content,
@@ -193,59 +362,66 @@ class WebScraper:
             if not url.startswith(("http://", "https://")):
                 url = f"https://{url}"
 
-            # Create SSL context that's more permissive
-            ssl_context = ssl.create_default_context()
-            ssl_context.check_hostname = False
-            ssl_context.verify_mode = ssl.CERT_NONE
-            # Set minimum TLS version to avoid DH key issues
-            ssl_context.minimum_version = ssl.TLSVersion.TLSv1_2
-
-            async with httpx.AsyncClient(
-                timeout=30.0,
-                follow_redirects=True,
-                verify=ssl_context,
-                headers={
-                    "User-Agent": (
-                        "Mozilla/5.0 (compatible; ThinkbridgeBot/1.0; "
-                        "+https://thinkbridge.com/bot)"
-                    )
-                },
-            ) as client:
-                # Get homepage
-                homepage_response = await client.get(url)
-                homepage_response.raise_for_status()
-
-                homepage_content = homepage_response.text
-                homepage_soup = BeautifulSoup(homepage_content, "html.parser")
-
-                # Extract text content
-                homepage_text = self._extract_text(homepage_soup)
-
-                # Try to find and scrape About page
-                about_url = self._find_about_page(url, homepage_soup)
-                about_text = ""
-
-                if about_url:
-                    try:
-                        about_response = await client.get(about_url)
-                        about_response.raise_for_status()
-                        about_soup = BeautifulSoup(about_response.text, "html.parser")
-                        about_text = self._extract_text(about_soup)
-                    except Exception as e:
-                        self.logger.warning(
-                            f"Failed to scrape About page {about_url}: {e}"
-                        )
+            client = await self._get_client()
 
+            # Get homepage (conditional GET against the revalidation cache)
+            try:
+                homepage_content = await self._fetch_html(client, url)
+            except ValueError as e:
+                self.logger.warning(f"{e} for {url}")
                 return {
                     "url": url,
-                    "homepage_content": homepage_content,
-                    "homepage_text": homepage_text,
-                    "about_url": about_url,
-                    "about_text": about_text,
+                    "content": "",
+                    "error": str(e),
                     "method": "httpx",
-                    "status": "success",
+                    "status": "failed",
                 }
 
+            homepage_soup = BeautifulSoup(homepage_content, _BS_PARSER)
+
+            # Extract text content, then drop the DOM so the tree is not
+            # held across the About-page roundtrip
+            homepage_text = self._extract_text(homepage_soup)
+            homepage_soup.decompose()
+
+            # Find the About page from an anchors-only parse; a separate
+            # lightweight tree also keeps links that _extract_text's
+            # nav/header/footer decompose would have discarded. The result
+            # is memoized on a cheap first-4KB fingerprint so retries on an
+            # unchanged homepage skip the scan entirely.
+            cache_key = (url, hash(homepage_content[:4096]))
+            if cache_key in self._about_cache:
+                about_url = self._about_cache[cache_key]
+            else:
+                link_soup = BeautifulSoup(
+                    homepage_content, "html.parser", parse_only=_LINK_STRAINER
+                )
+                about_url = self._find_about_page(url, link_soup)
+                link_soup.decompose()
+                if len(self._about_cache) >= 1024:
+                    self._about_cache.clear()
+                self._about_cache[cache_key] = about_url
+            about_text = ""
+
+            if about_url:
+                try:
+                    about_html = await self._fetch_html(client, about_url)
+                    about_soup = BeautifulSoup(about_html, _BS_PARSER)
+                    about_text = self._extract_text(about_soup)
+                    about_soup.decompose()
+                except Exception as e:
+                    self.logger.warning(f"Failed to scrape About page {about_url}: {e}")
+
+            return {
+                "url": url,
+                "homepage_content": homepage_content,
+                "homepage_text": homepage_text,
+                "about_url": about_url,
+                "about_text": about_text,
+                "method": "httpx",
+                "status": "success",
+            }
+
         except Exception as e:
             self.logger.error(f"HTTPX scraping failed for {url}: {e}")
             return {
@@ -269,13 +445,9 @@ class WebScraper:
         for script in soup(["script", "style", "nav", "footer", "header"]):
             script.decompose()
 
-        # Get text and clean it
-        text = soup.get_text()
-
-        # Clean up whitespace
-        lines = (line.strip() for line in text.splitlines())
-        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-        text = " ".join(chunk for chunk in chunks if chunk)
+        # Get text with explicit separators so element boundaries never fuse,
+        # then collapse all whitespace in one C-level pass
+        text = _WS_COLLAPSE_RE.sub(" ", soup.get_text(separator=" ")).strip()
 
         return text
 
@@ -289,34 +461,16 @@ class WebScraper:
         Returns:
             About page URL or None if not found
         """
-        about_keywords = [
-            "about",
-            "about-us",
-            "aboutus",
-            "company",
-            "our-story",
-            "who-we-are",
-            "whoweare",
-            "about-company",
-        ]
-
-        # Look for links containing about keywords
+        # Look for links whose href or text matches an about keyword; the
+        # IGNORECASE regex avoids lowercasing every link up front
         for link in soup.find_all("a", href=True):
-            href = link.get("href", "").lower()
-            text = link.get_text().lower()
-
-            # Check if link text or href contains about keywords
-            for keyword in about_keywords:
-                if keyword in href or keyword in text:
-                    about_url = link["href"]
-
-                    # Make relative URLs absolute
-                    if about_url.startswith("/"):
-                        about_url = urljoin(base_url, about_url)
-                    elif not about_url.startswith(("http://", "https://")):
-                        about_url = urljoin(base_url, about_url)
+            about_url = link["href"]
+            if _ABOUT_RE.search(about_url) or _ABOUT_RE.search(link.get_text()):
+                # Make relative URLs absolute
+                if not about_url.startswith(("http://", "https://")):
+                    about_url = urljoin(base_url, about_url)
 
-                    return about_url
+                return about_url
 
         return None
 
@@ -329,24 +483,31 @@ class WebScraper:
         Returns:
             List of scraped content dictionaries
         """
-        tasks = [self.scrape_company(url) for url in urls]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-
-        # Handle any exceptions
         processed_results: List[Dict[str, Any]] = []
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                processed_results.append(
-                    {
-                        "url": urls[i],
-                        "content": "",
-                        "error": str(result),
-                        "method": "failed",
-                        "status": "failed",
-                    }
-                )
-            else:
-                processed_results.append(result)  # type: ignore
+
+        # Dispatch in bounded batches so a huge URL list does not allocate
+        # one coroutine frame per URL up front
+        for start in range(0, len(urls), _SCRAPE_BATCH_SIZE):
+            batch = urls[start : start + _SCRAPE_BATCH_SIZE]
+            results = await asyncio.gather(
+                *(self.scrape_company(url) for url in batch),
+                return_exceptions=True,
+            )
+
+            # Handle any exceptions
+            for url, result in zip(batch, results):
+                if isinstance(result, Exception):
+                    processed_results.append(
+                        {
+                            "url": url,
+                            "content": "",
+                            "error": str(result),
+                            "method": "failed",
+                            "status": "failed",
+                        }
+                    )
+                else:
+                    processed_results.append(result)  # type: ignore
 
         return processed_results
 
@@ -357,6 +518,9 @@ def scrape_company_sync(
 ) -> Dict[str, Any]:
     """Synchronous wrapper for scraping a single company.
 
+    Intended for one-off calls only: each call spins up a fresh event loop
+    and HTTP client. Use scrape_companies_sync for batches.
+
     Args:
         url: Company website URL
         firecrawl_api_key: Firecrawl API key (optional)
@@ -364,5 +528,35 @@ def scrape_company_sync(
     Returns:
         Scraped content dictionary
     """
-    scraper = WebScraper(firecrawl_api_key)
-    return asyncio.run(scraper.scrape_company(url))
+
+    async def _scrape_and_close() -> Dict[str, Any]:
+        async with WebScraper(firecrawl_api_key) as scraper:
+            return await scraper.scrape_company(url)
+
+    return asyncio.run(_scrape_and_close())
+
+
+def scrape_companies_sync(
+    urls: List[str],
+    firecrawl_api_key: Optional[str] = None,
+    max_concurrent: int = 5,
+) -> List[Dict[str, Any]]:
+    """Synchronous wrapper for scraping many companies.
+
+    Drives a single event loop and shares one scraper (and HTTP client)
+    across all URLs, instead of paying loop and client setup per call.
+
+    Args:
+        urls: List of company website URLs
+        firecrawl_api_key: Firecrawl API key (optional)
+        max_concurrent: Maximum concurrent requests
+
+    Returns:
+        List of scraped content dictionaries
+    """
+
+    async def _scrape_all() -> List[Dict[str, Any]]:
+        async with WebScraper(firecrawl_api_key, max_concurrent) as scraper:
+            return await scraper.scrape_multiple_companies(urls)
+
+    return asyncio.run(_scrape_all())
@@ -5,14 +5,76 @@ This module provides the core vector storage functionality for the Sales Factshe
 Generation System, enabling RAG (Retrieval-Augmented Generation) workflows.
 """
 
-import json
+import io
 import logging
 import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
 
+import httpx
+import numpy as np
+import openai
+import orjson
+import tiktoken
 from openai import OpenAI
 
+# Embedding requests are split into sub-batches of this many inputs;
+# oversized lists would hit the API's input cap, and splitting lets the
+# sub-batches run concurrently
+_EMBED_BATCH_SIZE = 1000
+
+_F = TypeVar("_F", bound=Callable[..., Any])
+
+
+def _is_transient(exc: Exception) -> bool:
+    """Check whether an API error is worth retrying (429 or 5xx)."""
+    if isinstance(exc, openai.RateLimitError):
+        return True
+    if isinstance(exc, openai.APIStatusError):
+        return exc.status_code == 429 or exc.status_code >= 500
+    if isinstance(exc, httpx.HTTPStatusError):
+        status = exc.response.status_code
+        return status == 429 or status >= 500
+    return False
+
+
+def _retry(max_retries: int = 5, base: float = 1.0, cap: float = 32.0) -> Callable:
+    """Retry transient API failures with exponential backoff and jitter.
+
+    Rate limits and 5xx responses become a short sleep and another attempt
+    instead of aborting the whole pipeline; other exceptions propagate
+    immediately.
+    """
+
+    def decorator(func: _F) -> _F:
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            for attempt in range(max_retries):
+                try:
+                    return func(*args, **kwargs)
+                except Exception as e:
+                    if attempt == max_retries - 1 or not _is_transient(e):
+                        raise
+                    delay = min(cap, base * (2**attempt)) * (
+                        1.0 + random.random() * 0.5
+                    )
+                    logging.getLogger(__name__).warning(
+                        "Transient API error (%s), retry %d/%d in %.1fs",
+                        e,
+                        attempt + 1,
+                        max_retries - 1,
+                        delay,
+                    )
+                    time.sleep(delay)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
 
 class VectorStore:
     """
@@ -30,6 +92,7 @@ class VectorStore:
         api_key: Optional[str] = None,
         embedding_model: str = "text-embedding-3-small",
         max_concurrent: int = 5,
+        estimate_before_call: bool = False,
     ):
         """
         Initialize the vector store.
@@ -38,10 +101,14 @@ class VectorStore:
             api_key: OpenAI API key (or from environment)
             embedding_model: OpenAI embedding model to use
             max_concurrent: Maximum concurrent embedding requests
+            estimate_before_call: Log a token/cost estimate before each
+                embedding call (the API response reports actual usage,
+                so this is pure overhead unless you want the preview)
         """
         self.logger = logging.getLogger(__name__)
         self.embedding_model = embedding_model
         self.max_concurrent = max_concurrent
+        self.estimate_before_call = estimate_before_call
         self.total_cost = 0.0
 
         # Initialize OpenAI client
@@ -49,21 +116,47 @@ class VectorStore:
         if not api_key:
             raise ValueError("OpenAI API key required. Set OPENAI_API_KEY env var.")
 
-        self.client = OpenAI(api_key=api_key)
+        # Hand the SDK a tuned httpx client: a larger keep-alive pool so
+        # concurrent embedding/upload threads reuse warm connections
+        # instead of paying TLS handshakes, and a timeout generous
+        # enough for large embedding batches. (http2 would help further
+        # but the h2 extra is not a project dependency.)
+        self._http_client = httpx.Client(
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            timeout=60.0,
+        )
+        self.client = OpenAI(api_key=api_key, http_client=self._http_client)
 
         # Store mapping of company_id to vector_store_id
         self.company_stores: Dict[str, str] = {}
         self.metadata_file = Path("vector_stores_metadata.json")
         self._load_metadata()
 
+        # In-memory embedding index per company, populated at upload
+        # time; lets retrieval run vector searches locally instead of
+        # embedding each query in its own API round-trip. Vectors are
+        # stored int8-quantized with per-vector scales (see
+        # _build_quantized_index).
+        self._chunk_index: Dict[str, Dict[str, Any]] = {}
+
+        # BPE encoder for accurate token counting; built once here since
+        # encoder construction is expensive. Falls back to the old
+        # 4-chars-per-token heuristic if the BPE files are unavailable.
+        try:
+            self._token_encoder = tiktoken.encoding_for_model(embedding_model)
+        except Exception:
+            try:
+                self._token_encoder = tiktoken.get_encoding("cl100k_base")
+            except Exception:
+                self._token_encoder = None
+
     def _load_metadata(self) -> None:
         """Load existing vector store metadata from disk."""
         if self.metadata_file.exists():
             try:
-                with open(self.metadata_file, "r") as f:
-                    data = json.load(f)
-                    self.company_stores = data.get("company_stores", {})
-                    self.total_cost = data.get("total_cost", 0.0)
+                data = orjson.loads(self.metadata_file.read_bytes())
+                self.company_stores = data.get("company_stores", {})
+                self.total_cost = data.get("total_cost", 0.0)
                 self.logger.info(
                     f"Loaded metadata for {len(self.company_stores)} companies"
                 )
@@ -71,15 +164,18 @@ class VectorStore:
                 self.logger.warning(f"Failed to load metadata: {e}")
 
     def _save_metadata(self) -> None:
-        """Save vector store metadata to disk."""
+        """Save vector store metadata to disk atomically."""
         try:
             data = {
                 "company_stores": self.company_stores,
                 "total_cost": self.total_cost,
                 "embedding_model": self.embedding_model,
             }
-            with open(self.metadata_file, "w") as f:
-                json.dump(data, f, indent=2)
+            # Write to a sibling temp file and rename into place so a
+            # crash mid-write never leaves a truncated metadata file
+            tmp_file = self.metadata_file.with_suffix(".json.tmp")
+            tmp_file.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+            os.replace(tmp_file, self.metadata_file)
         except Exception as e:
             self.logger.error(f"Failed to save metadata: {e}")
 
@@ -93,10 +189,24 @@ class VectorStore:
         return (token_count / 1000) * cost_per_1k_tokens
 
     def _estimate_tokens(self, text: str) -> int:
-        """Estimate token count for text (rough approximation)."""
+        """Count tokens with the BPE encoder, or approximate without one."""
+        if self._token_encoder is not None:
+            return len(self._token_encoder.encode(text, disallowed_special=()))
         # Rough estimation: 1 token ≈ 4 characters
         return len(text) // 4
 
+    def _estimate_tokens_total(self, texts: List[str]) -> int:
+        """Sum token counts over many texts in one batched BPE pass."""
+        if self._token_encoder is not None:
+            encoded = self._token_encoder.encode_batch(texts, disallowed_special=())
+            return sum(len(ids) for ids in encoded)
+        return sum(len(text) // 4 for text in texts)
+
+    @_retry()
+    def _embed_batch(self, batch: List[str]) -> Any:
+        """Issue one embeddings request, retried on transient API errors."""
+        return self.client.embeddings.create(input=batch, model=self.embedding_model)
+
     def embed_chunks(self, chunks: List[str]) -> Tuple[List[List[float]], float]:
         """
         Generate embeddings for text chunks.
@@ -113,24 +223,38 @@ class VectorStore:
         try:
             self.logger.info(f"Generating embeddings for {len(chunks)} chunks")
 
-            # Estimate cost
-            total_tokens = sum(self._estimate_tokens(chunk) for chunk in chunks)
-            estimated_cost = self._calculate_embedding_cost(total_tokens)
-
-            self.logger.info(
-                f"Estimated tokens: {total_tokens}, cost: ${estimated_cost:.4f}"
-            )
+            # Pre-call estimate is opt-in: it tokenizes every chunk a
+            # second time purely for a log line, and the API response
+            # reports actual usage anyway
+            if self.estimate_before_call:
+                total_tokens = self._estimate_tokens_total(chunks)
+                estimated_cost = self._calculate_embedding_cost(total_tokens)
+                self.logger.info(
+                    f"Estimated tokens: {total_tokens}, cost: ${estimated_cost:.4f}"
+                )
 
-            # Generate embeddings
-            response = self.client.embeddings.create(
-                input=chunks, model=self.embedding_model
-            )
+            # Generate embeddings. Small lists go out as one request;
+            # oversized ones are split into sub-batches issued
+            # concurrently, with order preserved by pool.map
+            if len(chunks) <= _EMBED_BATCH_SIZE:
+                responses = [self._embed_batch(chunks)]
+            else:
+                slices = [
+                    chunks[i : i + _EMBED_BATCH_SIZE]
+                    for i in range(0, len(chunks), _EMBED_BATCH_SIZE)
+                ]
+                with ThreadPoolExecutor(max_workers=self.max_concurrent) as pool:
+                    responses = list(pool.map(self._embed_batch, slices))
 
             # Extract embeddings
-            embeddings = [item.embedding for item in response.data]
+            embeddings = [
+                item.embedding for response in responses for item in response.data
+            ]
 
             # Track actual cost
-            actual_tokens = response.usage.total_tokens
+            actual_tokens = sum(
+                response.usage.total_tokens for response in responses
+            )
             actual_cost = self._calculate_embedding_cost(actual_tokens)
             self.total_cost += actual_cost
 
@@ -145,6 +269,21 @@ class VectorStore:
             self.logger.error(f"Failed to generate embeddings: {e}")
             raise
 
+    @_retry()
+    def _create_store_with_retry(self, name: str, metadata: Dict[str, str]) -> Any:
+        """Create the remote vector store, retried on transient API errors."""
+        return self.client.vector_stores.create(name=name, metadata=metadata)
+
+    @_retry()
+    def _attach_chunk_file(self, store_id: str, fileobj: Any) -> None:
+        """Upload one chunk file and attach it to a store, with retries."""
+        if hasattr(fileobj, "seek"):
+            fileobj.seek(0)
+        file_obj = self.client.files.create(file=fileobj, purpose="assistants")
+        self.client.vector_stores.files.create(
+            vector_store_id=store_id, file_id=file_obj.id
+        )
+
     def create_vector_store(self, company_id: str, name: Optional[str] = None) -> str:
         """
         Create a new vector store for a company.
@@ -160,8 +299,8 @@ class VectorStore:
             store_name = name or f"Company_{company_id}"
 
             # Create vector store
-            vector_store = self.client.vector_stores.create(
-                name=store_name, metadata={"company_id": company_id}
+            vector_store = self._create_store_with_retry(
+                store_name, {"company_id": company_id}
             )
 
             store_id = vector_store.id
@@ -198,66 +337,139 @@ class VectorStore:
             raise ValueError("No chunks provided")
 
         try:
-            # Get or create vector store
-            if company_id not in self.company_stores:
-                store_id = self.create_vector_store(company_id)
-            else:
-                store_id = self.company_stores[company_id]
+            store_id = self._upload_company_files(company_id, chunks, chunk_metadata)
+
+            # Build the local embedding index in a single batched
+            # call; its actual token usage replaces the previous
+            # estimate (file storage itself is free)
+            embeddings, upload_cost = self.embed_chunks(chunks)
+            self._chunk_index[company_id] = self._build_quantized_index(
+                list(chunks), embeddings
+            )
 
-            # Create temporary files for chunks
-            temp_files = []
-            upload_cost = 0.0
+            self.logger.info(
+                f"Uploaded {len(chunks)} chunks to vector store {store_id}. "
+                f"Cost: ${upload_cost:.4f}"
+            )
 
-            try:
-                # Create individual files for each chunk
-                for i, chunk in enumerate(chunks):
-                    metadata = chunk_metadata[i] if chunk_metadata else {}
-
-                    # Create temporary file with chunk content
-                    temp_file = Path(f"temp_chunk_{company_id}_{i}.txt")
-                    with open(temp_file, "w", encoding="utf-8") as f:
-                        # Add metadata as header comments
-                        if metadata:
-                            f.write("# Metadata\n")
-                            for key, value in metadata.items():
-                                f.write(f"# {key}: {value}\n")
-                            f.write("\n")
-                        f.write(chunk)
-
-                    temp_files.append(temp_file)
-
-                # Upload files to vector store
-                for temp_file in temp_files:
-                    with open(temp_file, "rb") as f:
-                        file_obj = self.client.files.create(
-                            file=f, purpose="assistants"
-                        )
-
-                        # Add file to vector store
-                        self.client.vector_stores.files.create(
-                            vector_store_id=store_id, file_id=file_obj.id
-                        )
-
-                # Estimate upload cost (file storage is typically free, embeddings cost already tracked)
-                total_tokens = sum(self._estimate_tokens(chunk) for chunk in chunks)
-                upload_cost = self._calculate_embedding_cost(total_tokens)
-                self.total_cost += upload_cost
+            return store_id, upload_cost
 
-                self.logger.info(
-                    f"Uploaded {len(chunks)} chunks to vector store {store_id}. "
-                    f"Cost: ${upload_cost:.4f}"
+        except Exception as e:
+            self.logger.error(f"Failed to upload chunks for {company_id}: {e}")
+            raise
+
+    def _upload_company_files(
+        self,
+        company_id: str,
+        chunks: List[str],
+        chunk_metadata: Optional[List[Dict[str, Any]]] = None,
+    ) -> str:
+        """
+        Create (or reuse) the company store and attach chunk files to it.
+
+        Args:
+            company_id: Company identifier
+            chunks: List of text chunks
+            chunk_metadata: Optional metadata for each chunk
+
+        Returns:
+            Vector store ID
+        """
+        # Get or create vector store
+        if company_id not in self.company_stores:
+            store_id = self.create_vector_store(company_id)
+        else:
+            store_id = self.company_stores[company_id]
+
+        # Build each chunk file in memory; there is no reason to round
+        # trip through the filesystem just to hand bytes to the API
+        buffers = []
+        for i, chunk in enumerate(chunks):
+            metadata = chunk_metadata[i] if chunk_metadata else {}
+
+            parts = []
+            # Add metadata as header comments
+            if metadata:
+                parts.append("# Metadata\n")
+                for key, value in metadata.items():
+                    parts.append(f"# {key}: {value}\n")
+                parts.append("\n")
+            parts.append(chunk)
+
+            buf = io.BytesIO("".join(parts).encode("utf-8"))
+            # The SDK derives the uploaded filename from this attribute
+            buf.name = f"chunk_{company_id}_{i}.txt"
+            buffers.append(buf)
+
+        # Attach the chunk files concurrently; each upload is an
+        # independent network round trip
+        if len(buffers) == 1:
+            self._attach_chunk_file(store_id, buffers[0])
+        else:
+            with ThreadPoolExecutor(max_workers=self.max_concurrent) as pool:
+                list(pool.map(lambda b: self._attach_chunk_file(store_id, b), buffers))
+
+        return store_id
+
+    def upload_chunks_batched(
+        self,
+        items: List[Tuple[str, List[str], Optional[List[Dict[str, Any]]]]],
+    ) -> List[Tuple[str, float]]:
+        """
+        Upload chunks for several companies with one embeddings round-trip.
+
+        Files are still attached to each company's store, but the
+        embedding request — the only per-chunk API cost — covers every
+        chunk in the batch at once. The actual cost is attributed back to
+        each company in proportion to its estimated token share.
+
+        Args:
+            items: List of (company_id, chunks, chunk_metadata) tuples
+
+        Returns:
+            List of (vector_store_id, cost) tuples, aligned with items
+        """
+        if not items:
+            return []
+
+        try:
+            store_ids = []
+            spans = []
+            all_chunks: List[str] = []
+            for company_id, chunks, chunk_metadata in items:
+                if not chunks:
+                    raise ValueError(f"No chunks provided for {company_id}")
+                store_ids.append(
+                    self._upload_company_files(company_id, chunks, chunk_metadata)
                 )
+                spans.append((len(all_chunks), len(all_chunks) + len(chunks)))
+                all_chunks.extend(chunks)
+
+            embeddings, total_cost = self.embed_chunks(all_chunks)
 
-                return store_id, upload_cost
+            token_counts = [
+                self._estimate_tokens_total(chunks) for _, chunks, _ in items
+            ]
+            total_tokens = sum(token_counts) or 1
 
-            finally:
-                # Clean up temporary files
-                for temp_file in temp_files:
-                    if temp_file.exists():
-                        temp_file.unlink()
+            results = []
+            for (company_id, chunks, _), (start, end), tokens, store_id in zip(
+                items, spans, token_counts, store_ids
+            ):
+                self._chunk_index[company_id] = self._build_quantized_index(
+                    list(chunks), embeddings[start:end]
+                )
+                results.append((store_id, total_cost * (tokens / total_tokens)))
+
+            self.logger.info(
+                f"Uploaded {len(all_chunks)} chunks for {len(items)} companies "
+                f"in one batch. Cost: ${total_cost:.4f}"
+            )
+
+            return results
 
         except Exception as e:
-            self.logger.error(f"Failed to upload chunks for {company_id}: {e}")
+            self.logger.error(f"Batched upload failed for {len(items)} companies: {e}")
             raise
 
     def similarity_search(
@@ -282,60 +494,21 @@ class VectorStore:
         try:
             store_id = self.company_stores[company_id]
 
-            # Create assistant with vector store for search
-            assistant = self.client.beta.assistants.create(
-                instructions="You are a helpful assistant that searches company data.",
-                model="gpt-4o-mini",  # Use cheaper model for search
-                tools=[{"type": "file_search"}],
-                tool_resources={"file_search": {"vector_store_ids": [store_id]}},
-            )
-
-            # Create thread and search
-            thread = self.client.beta.threads.create()
-
-            # Add query message
-            self.client.beta.threads.messages.create(
-                thread_id=thread.id,
-                role="user",
-                content=f"Search for information about: {query}",
+            # Query the vector store search endpoint directly; it
+            # returns ranked chunks with real relevance scores in a
+            # single round trip
+            response = self.client.vector_stores.search(
+                vector_store_id=store_id,
+                query=query,
+                max_num_results=top_k,
             )
 
-            # Run search
-            run = self.client.beta.threads.runs.create(
-                thread_id=thread.id, assistant_id=assistant.id
-            )
-
-            # Wait for completion (simplified - in production, use proper polling)
-            import time
-
-            while run.status in ["queued", "in_progress"]:
-                time.sleep(1)
-                run = self.client.beta.threads.runs.retrieve(
-                    thread_id=thread.id, run_id=run.id
-                )
-
-            # Get response messages
-            messages = self.client.beta.threads.messages.list(thread_id=thread.id)
-
-            # Extract relevant chunks from file citations
             results = []
-            for message in messages.data:
-                if message.role == "assistant":
-                    # Process message content and extract file citations
-                    # Note: This is a simplified implementation
-                    # In practice, you'd extract the actual chunk texts and scores
-                    content = message.content[0].text.value if message.content else ""
-                    if content and len(results) < top_k:
-                        # Placeholder similarity score (in real implementation, extract from API)
-                        similarity_score = 0.8 - (len(results) * 0.1)
-                        if (
-                            1.0 - similarity_score <= max_distance
-                        ):  # Convert to distance
-                            results.append((content[:500], similarity_score))
-
-            # Clean up
-            self.client.beta.assistants.delete(assistant.id)
-            self.client.beta.threads.delete(thread.id)
+            for item in response.data:
+                score = item.score
+                if 1.0 - score <= max_distance:  # Convert to distance
+                    text = item.content[0].text if item.content else ""
+                    results.append((text, score))
 
             # Track search cost (minimal for file search)
             search_cost = self._calculate_embedding_cost(self._estimate_tokens(query))
@@ -352,6 +525,110 @@ class VectorStore:
             self.logger.error(f"Similarity search failed for {company_id}: {e}")
             return []
 
+    def _build_quantized_index(
+        self, chunks: List[str], embeddings: List[List[float]]
+    ) -> Dict[str, Any]:
+        """
+        Build an int8-quantized local index from chunk embeddings.
+
+        Similarity search over float32 vectors is memory-bandwidth
+        bound; storing int8 values with one float32 scale and norm per
+        vector cuts the bytes read per search by ~4x with negligible
+        recall loss for dot-product ranking.
+
+        Args:
+            chunks: Chunk texts, aligned with embeddings
+            embeddings: Float embedding vectors
+
+        Returns:
+            Index dict with quantized vectors, scales, and norms
+        """
+        matrix = np.asarray(embeddings, dtype=np.float32)
+        if matrix.size == 0:
+            return {
+                "chunks": chunks,
+                "quantized": matrix.astype(np.int8),
+                "scales": np.empty(0, dtype=np.float32),
+                "norms": np.empty(0, dtype=np.float32),
+            }
+
+        scales = np.max(np.abs(matrix), axis=1)
+        scales[scales == 0.0] = 1.0
+        quantized = np.round(matrix / scales[:, None] * 127.0).astype(np.int8)
+
+        return {
+            "chunks": chunks,
+            "quantized": quantized,
+            "scales": scales,
+            "norms": np.linalg.norm(matrix, axis=1),
+        }
+
+    def embed_queries(self, queries: List[str]) -> List[List[float]]:
+        """
+        Embed search queries in a single batched API call.
+
+        Args:
+            queries: List of query strings
+
+        Returns:
+            List of embedding vectors, one per query
+        """
+        embeddings, _ = self.embed_chunks(list(queries))
+        return embeddings
+
+    def has_local_index(self, company_id: str) -> bool:
+        """Check whether a local embedding index exists for a company."""
+        return company_id in self._chunk_index
+
+    def similarity_search_vectors(
+        self,
+        query_vector: List[float],
+        company_id: str,
+        top_k: int = 6,
+        max_distance: float = 0.25,
+    ) -> List[Tuple[str, float]]:
+        """
+        Perform similarity search with a precomputed query vector.
+
+        Skips the per-query embed step entirely: the caller batch-embeds
+        its queries once and this method ranks the company's locally
+        indexed chunks by cosine similarity.
+
+        Args:
+            query_vector: Embedding vector of the query
+            company_id: Company identifier
+            top_k: Number of top results to return
+            max_distance: Maximum cosine distance threshold
+
+        Returns:
+            List of (chunk_text, similarity_score) tuples
+        """
+        index = self._chunk_index.get(company_id)
+        if not index or index["quantized"].size == 0:
+            self.logger.warning(f"No local index found for company {company_id}")
+            return []
+
+        # Quantize the query the same way as the stored vectors, rank
+        # with an integer dot product, then rescale back to cosine
+        query = np.asarray(query_vector, dtype=np.float32)
+        query_scale = float(np.max(np.abs(query))) or 1.0
+        query_int8 = np.round(query / query_scale * 127.0).astype(np.int8)
+
+        dots = index["quantized"].astype(np.int32) @ query_int8.astype(np.int32)
+        dots = dots.astype(np.float32) * (
+            index["scales"] * query_scale / (127.0 * 127.0)
+        )
+
+        denominators = index["norms"] * np.linalg.norm(query)
+        similarities = dots / np.where(denominators == 0.0, 1.0, denominators)
+
+        order = np.argsort(similarities)[::-1][:top_k]
+        return [
+            (index["chunks"][i], float(similarities[i]))
+            for i in order
+            if 1.0 - similarities[i] <= max_distance
+        ]
+
     def get_company_store_id(self, company_id: str) -> Optional[str]:
         """Get vector store ID for a company."""
         return self.company_stores.get(company_id)
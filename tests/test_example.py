@@ -26,12 +26,12 @@ class TestGreet:
 class TestFetchData:
     """Test cases for the fetch_data function."""
 
-    @patch("thinkbridge.example.requests.get")
+    @patch("thinkbridge.example._SESSION.get")
     def test_fetch_data_success(self, mock_get: Mock) -> None:
         """Test successful data fetching."""
         # Mock the response
         mock_response = Mock()
-        mock_response.json.return_value = {"message": "Hello, World!"}
+        mock_response.content = b'{"message": "Hello, World!"}'
         mock_response.raise_for_status.return_value = None
         mock_get.return_value = mock_response
 
@@ -40,7 +40,7 @@ class TestFetchData:
         assert result == {"message": "Hello, World!"}
         mock_get.assert_called_once_with("https://api.example.com/data")
 
-    @patch("thinkbridge.example.requests.get")
+    @patch("thinkbridge.example._SESSION.get")
     def test_fetch_data_failure(self, mock_get: Mock) -> None:
         """Test that fetch_data raises an exception on failure."""
         # Mock a failed response
@@ -2,6 +2,9 @@
 Unit tests for the generation engine module.
 """
 
+import hashlib
+import shutil
+import tempfile
 import unittest
 from unittest.mock import Mock, patch
 
@@ -10,11 +13,24 @@ import pytest
 from thinkbridge.generate import FactsheetGenerator
 
 
+def make_stream(*texts: str) -> list:
+    """Build a mock streamed completion yielding one delta per text."""
+    chunks = []
+    for text in texts:
+        chunk = Mock()
+        chunk.choices = [Mock()]
+        chunk.choices[0].delta.content = text
+        chunks.append(chunk)
+    return chunks
+
+
 class TestFactsheetGenerator(unittest.TestCase):
     """Test cases for FactsheetGenerator class."""
 
     def setUp(self) -> None:
         """Set up test fixtures."""
+        # Isolated disk-cache directory so tests never share entries
+        self.cache_dir = tempfile.mkdtemp()
         # Mock dependencies to avoid real API calls
         with (
             patch("thinkbridge.generate.OpenAI"),
@@ -26,8 +42,13 @@ class TestFactsheetGenerator(unittest.TestCase):
                 model="gpt-4",
                 max_tokens=1000,
                 temperature=0.3,
+                cache_dir=self.cache_dir,
             )
 
+    def tearDown(self) -> None:
+        """Clean up the temporary cache directory."""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
     def test_init_default_params(self) -> None:
         """Test initialization with default parameters."""
         with (
@@ -239,17 +260,10 @@ class TestFactsheetGenerator(unittest.TestCase):
             {"content": "Example company overview content"}
         ]
 
-        # Mock OpenAI response
-        mock_response = Mock()
-        mock_response.choices = [Mock()]
-        mock_response.choices[0].message.content = " ".join(
-            ["word"] * 800
-        )  # Valid word count
-
         self.generator.template_manager = mock_template_manager
         self.generator.vector_store = mock_vector_store
         self.generator.openai_client.chat.completions.create.return_value = (
-            mock_response
+            make_stream(" ".join(["word"] * 800))  # Valid word count
         )
 
         result = self.generator.generate_factsheet("https://example.com", "Technology")
@@ -303,23 +317,11 @@ class TestFactsheetGenerator(unittest.TestCase):
         mock_vector_store.similarity_search.return_value = [{"content": "Test content"}]
 
         # Mock OpenAI responses - first too short, second valid
-        mock_response_short = Mock()
-        mock_response_short.choices = [Mock()]
-        mock_response_short.choices[0].message.content = " ".join(
-            ["word"] * 500
-        )  # Too short
-
-        mock_response_valid = Mock()
-        mock_response_valid.choices = [Mock()]
-        mock_response_valid.choices[0].message.content = " ".join(
-            ["word"] * 800
-        )  # Valid
-
         self.generator.template_manager = mock_template_manager
         self.generator.vector_store = mock_vector_store
         self.generator.openai_client.chat.completions.create.side_effect = [
-            mock_response_short,
-            mock_response_valid,
+            make_stream(" ".join(["word"] * 500)),  # Too short
+            make_stream(" ".join(["word"] * 800)),  # Valid
         ]
 
         result = self.generator.generate_factsheet("https://example.com", "Technology")
@@ -329,22 +331,138 @@ class TestFactsheetGenerator(unittest.TestCase):
         assert result["word_count_valid"] is True
         assert result["attempt"] == 2  # Should show retry happened
 
+    @patch("thinkbridge.generate.TemplateManager")
+    @patch("thinkbridge.generate.VectorStore")
+    def test_generate_factsheet_cached(
+        self, mock_vector_store_class, mock_template_manager_class
+    ) -> None:
+        """Test that a repeated generation is served from the cache."""
+        mock_template_manager = Mock()
+        mock_template_manager_class.return_value = mock_template_manager
+        mock_template_manager.get_template.return_value = "# {company_name}"
+        mock_template_manager.get_template_placeholders.return_value = {"company_name"}
+
+        mock_vector_store = Mock()
+        mock_vector_store_class.return_value = mock_vector_store
+        mock_vector_store.get_company_store_id.return_value = "vs_test123"
+        mock_vector_store.similarity_search.return_value = [{"content": "Test content"}]
+
+        self.generator.template_manager = mock_template_manager
+        self.generator.vector_store = mock_vector_store
+        self.generator.openai_client.chat.completions.create.return_value = (
+            make_stream(" ".join(["word"] * 800))
+        )
+
+        first = self.generator.generate_factsheet("https://example.com", "Technology")
+        second = self.generator.generate_factsheet("https://example.com", "Technology")
+
+        assert first["status"] == "success"
+        assert second["factsheet"] == first["factsheet"]
+        # Only the first call should reach the API
+        assert self.generator.openai_client.chat.completions.create.call_count == 1
+        assert self.generator.cache_hits == 1
+        assert self.generator.cache_misses == 1
+
+    @patch("thinkbridge.generate.TemplateManager")
+    @patch("thinkbridge.generate.VectorStore")
+    def test_generate_factsheet_truncates_overlong_stream(
+        self, mock_vector_store_class, mock_template_manager_class
+    ) -> None:
+        """Test that an over-long stream is cut off without retrying."""
+        mock_template_manager = Mock()
+        mock_template_manager_class.return_value = mock_template_manager
+        mock_template_manager.get_template.return_value = "# {company_name}"
+        mock_template_manager.get_template_placeholders.return_value = {"company_name"}
+
+        mock_vector_store = Mock()
+        mock_vector_store_class.return_value = mock_vector_store
+        mock_vector_store.get_company_store_id.return_value = "vs_test123"
+        mock_vector_store.similarity_search.return_value = [{"content": "Test content"}]
+
+        self.generator.template_manager = mock_template_manager
+        self.generator.vector_store = mock_vector_store
+        self.generator.openai_client.chat.completions.create.return_value = (
+            make_stream(" ".join(["word"] * 1100), "SHOULD NOT APPEAR")
+        )
+
+        result = self.generator.generate_factsheet("https://example.com", "Technology")
+
+        assert result["status"] == "success"
+        assert "SHOULD NOT APPEAR" not in result["factsheet"]
+        assert result["word_count_valid"] is False
+        # Truncation means no retry: exactly one API call
+        assert self.generator.openai_client.chat.completions.create.call_count == 1
+
+    @patch("thinkbridge.generate.TemplateManager")
+    @patch("thinkbridge.generate.VectorStore")
+    def test_generate_factsheet_structured_output(
+        self, mock_vector_store_class, mock_template_manager_class
+    ) -> None:
+        """Test structured-output generation assembles the template."""
+        import json
+
+        with (
+            patch("thinkbridge.generate.OpenAI"),
+            patch("thinkbridge.generate.VectorStore"),
+            patch("thinkbridge.generate.TemplateManager"),
+        ):
+            generator = FactsheetGenerator(
+                openai_api_key="test_key",
+                structured_output=True,
+                cache_dir=self.cache_dir,
+            )
+
+        mock_template_manager = Mock()
+        mock_template_manager_class.return_value = mock_template_manager
+        mock_template_manager.get_template.return_value = (
+            "# {company_name}\n## Overview\n{company_overview}"
+        )
+        mock_template_manager.get_template_placeholders.return_value = {
+            "company_name",
+            "company_overview",
+        }
+
+        mock_vector_store = Mock()
+        mock_vector_store_class.return_value = mock_vector_store
+        mock_vector_store.get_company_store_id.return_value = "vs_test123"
+        mock_vector_store.similarity_search.return_value = [{"content": "Test content"}]
+
+        mock_response = Mock()
+        mock_response.choices = [Mock()]
+        mock_response.choices[0].message.content = json.dumps(
+            {"company_name": "Example", "company_overview": "An example company."}
+        )
+
+        generator.template_manager = mock_template_manager
+        generator.vector_store = mock_vector_store
+        generator.openai_client.chat.completions.create.return_value = mock_response
+
+        result = generator.generate_factsheet("https://example.com", "Technology")
+
+        assert result["status"] == "success"
+        assert result["structured_output"] is True
+        assert result["factsheet"] == "# Example\n## Overview\nAn example company."
+        # Single call, schema-constrained response format
+        create_kwargs = generator.openai_client.chat.completions.create.call_args[1]
+        assert create_kwargs["response_format"]["type"] == "json_schema"
+        assert generator.openai_client.chat.completions.create.call_count == 1
+
     def test_generate_multiple_factsheets(self) -> None:
         """Test generating multiple factsheets."""
-        # Mock the single generation method
+        # Mock the single generation method; keyed on the url since
+        # companies run concurrently in nondeterministic order
         with patch.object(self.generator, "generate_factsheet") as mock_generate:
-            mock_generate.side_effect = [
-                {"status": "success", "company_url": "https://example1.com"},
-                {"status": "success", "company_url": "https://example2.com"},
-            ]
+            mock_generate.side_effect = lambda url, industry: {
+                "status": "success",
+                "company_url": url,
+            }
 
             companies = [
                 ("https://example1.com", "Technology"),
                 ("https://example2.com", "Construction"),
             ]
 
-            with patch("time.sleep"):  # Speed up test
-                results = self.generator.generate_multiple_factsheets(companies)
+            results = self.generator.generate_multiple_factsheets(companies)
 
             assert len(results) == 2
             assert results[0]["company_url"] == "https://example1.com"
@@ -353,6 +471,131 @@ class TestFactsheetGenerator(unittest.TestCase):
             # Should have called generate_factsheet twice
             assert mock_generate.call_count == 2
 
+    def test_generate_factsheets_batched(self) -> None:
+        """Test batched generation preserves order across batches."""
+        with patch.object(self.generator, "generate_factsheet") as mock_generate:
+            mock_generate.side_effect = lambda url, industry: {
+                "status": "success",
+                "company_url": url,
+            }
+
+            companies = [
+                ("https://example1.com", "Technology"),
+                ("https://example2.com", "Construction"),
+                ("https://example3.com", "Healthcare"),
+            ]
+
+            results = self.generator.generate_factsheets_batched(
+                companies, batch_size=2
+            )
+
+            assert len(results) == 3
+            assert [r["company_url"] for r in results] == [
+                "https://example1.com",
+                "https://example2.com",
+                "https://example3.com",
+            ]
+            assert mock_generate.call_count == 3
+
+    @patch("thinkbridge.generate.TemplateManager")
+    @patch("thinkbridge.generate.VectorStore")
+    def test_generate_factsheets_batch_api(
+        self, mock_vector_store_class, mock_template_manager_class
+    ) -> None:
+        """Test generation through the Batch API path."""
+        import json
+
+        mock_template_manager = Mock()
+        mock_template_manager_class.return_value = mock_template_manager
+        mock_template_manager.get_template.return_value = "# {company_name}"
+        mock_template_manager.get_template_placeholders.return_value = {"company_name"}
+
+        mock_vector_store = Mock()
+        mock_vector_store_class.return_value = mock_vector_store
+        mock_vector_store.get_company_store_id.return_value = "vs_test123"
+        mock_vector_store.similarity_search.return_value = [{"content": "Test content"}]
+
+        self.generator.template_manager = mock_template_manager
+        self.generator.vector_store = mock_vector_store
+
+        client = self.generator.openai_client
+        client.files.create.return_value = Mock(id="file-in")
+        client.batches.create.return_value = Mock(
+            id="batch-1", status="completed", output_file_id="file-out"
+        )
+        output_record = {
+            "custom_id": "https://example.com",
+            "response": {
+                "body": {
+                    "choices": [{"message": {"content": " ".join(["word"] * 800)}}]
+                }
+            },
+        }
+        client.files.content.return_value = Mock(text=json.dumps(output_record))
+
+        results = self.generator.generate_factsheets_batched(
+            [("https://example.com", "Technology")], use_batch_api=True
+        )
+
+        assert len(results) == 1
+        assert results[0]["status"] == "success"
+        assert results[0]["word_count"] == 800
+        assert results[0]["via_batch_api"] is True
+        client.batches.create.assert_called_once()
+
+    @patch("thinkbridge.generate.TemplateManager")
+    @patch("thinkbridge.generate.VectorStore")
+    def test_disk_cache_persists_across_instances(
+        self, mock_vector_store_class, mock_template_manager_class
+    ) -> None:
+        """Test that a fresh generator reuses the disk-cached factsheet."""
+        mock_template_manager = Mock()
+        mock_template_manager_class.return_value = mock_template_manager
+        mock_template_manager.get_template.return_value = "# {company_name}"
+        mock_template_manager.get_template_placeholders.return_value = {"company_name"}
+
+        mock_vector_store = Mock()
+        mock_vector_store_class.return_value = mock_vector_store
+        mock_vector_store.get_company_store_id.return_value = "vs_test123"
+        mock_vector_store.similarity_search.return_value = [{"content": "Test content"}]
+
+        self.generator.template_manager = mock_template_manager
+        self.generator.vector_store = mock_vector_store
+        self.generator.openai_client.chat.completions.create.return_value = (
+            make_stream(" ".join(["word"] * 800))
+        )
+
+        first = self.generator.generate_factsheet("https://example.com", "Technology")
+        assert first["status"] == "success"
+
+        # A brand-new generator over the same cache directory should be
+        # served from disk without touching the API
+        with (
+            patch("thinkbridge.generate.OpenAI"),
+            patch("thinkbridge.generate.VectorStore"),
+            patch("thinkbridge.generate.TemplateManager"),
+        ):
+            fresh = FactsheetGenerator(
+                openai_api_key="test_key", cache_dir=self.cache_dir
+            )
+        fresh.template_manager = mock_template_manager
+
+        second = fresh.generate_factsheet("https://example.com", "Technology")
+
+        assert second["factsheet"] == first["factsheet"]
+        assert fresh.openai_client.chat.completions.create.call_count == 0
+        assert fresh.cache_hits == 1
+
+        # Invalidation clears the company's entries from disk; build the
+        # key the same way generate_factsheet does
+        template_hash = hashlib.sha256(
+            "Technology|# {company_name}".encode()
+        ).hexdigest()
+        cache_key = f"factsheet:https://example.com|{template_hash}"
+        assert fresh._disk_cache.get(cache_key) is not None
+        assert fresh.invalidate("https://example.com") > 0
+        assert fresh._disk_cache.get(cache_key) is None
+
     def test_get_cost_summary(self) -> None:
         """Test cost summary generation."""
         self.generator.total_generation_cost = 0.05
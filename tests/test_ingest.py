@@ -5,8 +5,9 @@ Unit tests for the ingest CLI module.
 import asyncio
 import json
 import tempfile
+import zlib
 from pathlib import Path
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
 import pandas as pd
 import pytest
@@ -60,12 +61,12 @@ class TestIngestCLI:
         self.create_test_csv(test_data)
 
         ingest = IngestCLI(str(self.csv_path))
-        df = ingest.validate_csv()
+        urls, industries = ingest.validate_csv()
 
-        assert len(df) == 2
-        assert list(df.columns) == ["url", "industry"]
-        assert df.iloc[0]["url"] == "https://example.com"
-        assert df.iloc[0]["industry"] == "technology"
+        assert len(urls) == 2
+        assert len(industries) == 2
+        assert urls[0] == "https://example.com"
+        assert industries[0] == "technology"
 
     def test_validate_csv_missing_file(self) -> None:
         """Test CSV validation with missing file."""
@@ -107,11 +108,11 @@ class TestIngestCLI:
         self.create_test_csv(test_data)
 
         ingest = IngestCLI(str(self.csv_path))
-        df = ingest.validate_csv()
+        urls, industries = ingest.validate_csv()
 
         # Should only have the first row with complete data
-        assert len(df) == 1
-        assert df.iloc[0]["url"] == "https://example.com"
+        assert len(urls) == 1
+        assert urls[0] == "https://example.com"
 
     def test_checkpoint_save_and_load(self) -> None:
         """Test checkpoint save and load functionality."""
@@ -140,6 +141,42 @@ class TestIngestCLI:
         assert len(new_ingest.failed_companies) == 1
         assert new_ingest.failed_companies[0]["url"] == "https://failed.com"
 
+    def test_checkpoint_journal_replay(self) -> None:
+        """Test that journal records since the last snapshot are replayed."""
+        ingest = IngestCLI(
+            str(self.csv_path),
+            str(self.checkpoint_path),
+            enable_vector_store=False,
+            force_rescrape=False,
+        )
+        ingest.processed_companies = ["https://example.com"]
+        ingest.save_checkpoint()
+
+        journal = self.checkpoint_path.with_suffix(".jsonl")
+        journal.write_text(
+            json.dumps({"url": "https://new.com", "status": "ok"})
+            + "\n"
+            + json.dumps(
+                {"url": "https://bad.com", "status": "failed", "error": "boom"}
+            )
+            + "\n"
+        )
+
+        new_ingest = IngestCLI(
+            str(self.csv_path),
+            str(self.checkpoint_path),
+            enable_vector_store=False,
+            force_rescrape=False,
+        )
+        new_ingest.load_checkpoint()
+
+        assert new_ingest.processed_companies == [
+            "https://example.com",
+            "https://new.com",
+        ]
+        assert len(new_ingest.failed_companies) == 1
+        assert new_ingest.failed_companies[0]["url"] == "https://bad.com"
+
     def test_checkpoint_load_nonexistent(self) -> None:
         """Test loading non-existent checkpoint file."""
         ingest = IngestCLI(
@@ -236,8 +273,13 @@ class TestIngestCLI:
         ]
         self.create_test_csv(test_data)
 
-        ingest = IngestCLI(str(self.csv_path))
-        df = ingest.validate_csv()
+        ingest = IngestCLI(
+            str(self.csv_path),
+            str(self.checkpoint_path),
+            enable_vector_store=False,
+            force_rescrape=False,
+        )
+        urls, industries = ingest.validate_csv()
 
         # Mock the scraper and cleaner
         with (
@@ -285,6 +327,7 @@ class TestIngestCLI:
             )
 
             mock_scraper.scrape_company.side_effect = [future1, future2, future3]
+            mock_scraper.aclose = AsyncMock()
             mock_scraper_class.return_value = mock_scraper
 
             # Mock cleaner
@@ -311,7 +354,7 @@ class TestIngestCLI:
             ]
             mock_cleaner_class.return_value = mock_cleaner
 
-            await ingest.process_companies_async(df, max_concurrent=2)
+            await ingest.process_companies_async(urls, industries, max_concurrent=2)
 
             # Should have 2 successful and 1 failed
             assert len(ingest.processed_companies) == 2
@@ -337,7 +380,7 @@ class TestIngestCLI:
         # Simulate already processed company
         ingest.processed_companies = ["https://test1.com"]
 
-        df = ingest.validate_csv()
+        urls, industries = ingest.validate_csv()
 
         # Mock the scraper and cleaner
         with (
@@ -360,6 +403,7 @@ class TestIngestCLI:
                 }
             )
             mock_scraper.scrape_company.return_value = future
+            mock_scraper.aclose = AsyncMock()
             mock_scraper_class.return_value = mock_scraper
 
             # Mock cleaner
@@ -374,7 +418,7 @@ class TestIngestCLI:
             }
             mock_cleaner_class.return_value = mock_cleaner
 
-            await ingest.process_companies_async(df, max_concurrent=2)
+            await ingest.process_companies_async(urls, industries, max_concurrent=2)
 
             # Should only process the new company
             assert len(ingest.processed_companies) == 2
@@ -468,8 +512,7 @@ class TestIngestCLICommand:
         assert result.exit_code == 0
         assert self.checkpoint_path.exists()
 
-        # Verify checkpoint file content
-        with open(self.checkpoint_path, "r") as f:
-            checkpoint_data = json.load(f)
-            assert "processed" in checkpoint_data
-            assert "failed" in checkpoint_data
+        # Verify checkpoint file content (zlib-compressed compact JSON)
+        checkpoint_data = json.loads(zlib.decompress(self.checkpoint_path.read_bytes()))
+        assert "processed" in checkpoint_data
+        assert "failed" in checkpoint_data
@@ -59,6 +59,8 @@ class TestFactsheetWriter(unittest.TestCase):
             ("Multi   Word    Name", "multi-word-name"),
             ("Special@#$%Characters", "specialcharacters"),
             ("Hyphen-Already-Present", "hyphen-already-present"),
+            ("Weird™ Name", "weird-name"),
+            ("Bullet • Co", "bullet-co"),
             ("A", "example"),  # Short name falls back to URL
         ]
 
@@ -297,10 +299,34 @@ Accuracy score: 0.85
         assert result["factsheet"]["status"] == "success"
         assert result["accuracy_report"] is None
 
+    def test_write_many_async(self) -> None:
+        """Test concurrent writing of multiple companies."""
+        import asyncio
+
+        jobs = [
+            (
+                f"https://example{i}.com",
+                f"# Company {i}\n\n" + " ".join(["word"] * 700),
+                f"# Company {i} Report\n\nScore: 0.8" if i % 2 == 0 else None,
+            )
+            for i in range(3)
+        ]
+
+        results = asyncio.run(self.writer.write_many(jobs))
+
+        assert len(results) == 3
+        for result in results:
+            assert result["overall_status"] == "success"
+            assert result["factsheet"]["status"] == "success"
+            assert Path(result["factsheet"]["filepath"]).exists()
+
+        # 3 factsheets + 2 accuracy reports should be tracked
+        assert len(self.writer.get_written_files()) == 5
+
     def test_write_error_handling(self) -> None:
         """Test error handling in file writing."""
         # Test with invalid directory permissions (mock)
-        with patch("builtins.open", side_effect=PermissionError("Access denied")):
+        with patch("os.open", side_effect=PermissionError("Access denied")):
             result = self.writer.write_factsheet("https://example.com", "Content")
 
             assert result["status"] == "error"
@@ -2,13 +2,17 @@
 Unit tests for the scraper module.
 """
 
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
 import httpx
 import pytest
 from bs4 import BeautifulSoup
 
-from thinkbridge.scraper import WebScraper, scrape_company_sync
+from thinkbridge.scraper import (
+    WebScraper,
+    scrape_companies_sync,
+    scrape_company_sync,
+)
 
 
 class TestWebScraper:
@@ -24,6 +28,16 @@ class TestWebScraper:
         assert scraper.firecrawl_api_key == "test_key"
         assert scraper.max_concurrent == 5
 
+    @pytest.mark.asyncio
+    async def test_set_concurrency(self) -> None:
+        """Test adjusting the concurrency cap at runtime."""
+        scraper = WebScraper(max_concurrent=2)
+
+        await scraper.set_concurrency(5)
+
+        assert scraper.max_concurrent == 5
+        assert scraper._cap == 5
+
     @pytest.mark.asyncio
     async def test_scrape_company_success(self) -> None:
         """Test successful company scraping."""
@@ -39,11 +53,10 @@ class TestWebScraper:
         </html>
         """
         mock_response.raise_for_status.return_value = None
+        mock_response.headers = {"content-type": "text/html"}
 
         with patch("httpx.AsyncClient") as mock_client:
-            mock_client.return_value.__aenter__.return_value.get.return_value = (
-                mock_response
-            )
+            mock_client.return_value.get = AsyncMock(return_value=mock_response)
 
             result = await self.scraper.scrape_company("https://test.com")
 
@@ -57,8 +70,8 @@ class TestWebScraper:
     async def test_scrape_company_failure(self) -> None:
         """Test company scraping failure."""
         with patch("httpx.AsyncClient") as mock_client:
-            mock_client.return_value.__aenter__.return_value.get.side_effect = (
-                httpx.HTTPError("Connection failed")
+            mock_client.return_value.get = AsyncMock(
+                side_effect=httpx.HTTPError("Connection failed")
             )
 
             result = await self.scraper.scrape_company("https://invalid.com")
@@ -148,16 +161,17 @@ class TestWebScraper:
         mock_response1 = Mock()
         mock_response1.text = "<html><body><h1>Company 1</h1></body></html>"
         mock_response1.raise_for_status.return_value = None
+        mock_response1.headers = {"content-type": "text/html"}
 
         mock_response2 = Mock()
         mock_response2.text = "<html><body><h1>Company 2</h1></body></html>"
         mock_response2.raise_for_status.return_value = None
+        mock_response2.headers = {"content-type": "text/html"}
 
         with patch("httpx.AsyncClient") as mock_client:
-            mock_client.return_value.__aenter__.return_value.get.side_effect = [
-                mock_response1,
-                mock_response2,
-            ]
+            mock_client.return_value.get = AsyncMock(
+                side_effect=[mock_response1, mock_response2]
+            )
 
             results = await self.scraper.scrape_multiple_companies(urls)
 
@@ -195,6 +209,20 @@ class TestScraperSync:
             assert result["status"] == "success"
             mock_run.assert_called_once()
 
+    def test_scrape_companies_sync(self) -> None:
+        """Test batch synchronous scraping wrapper uses one loop."""
+        with patch("asyncio.run") as mock_run:
+            mock_run.return_value = [
+                {"url": "https://test1.com", "status": "success"},
+                {"url": "https://test2.com", "status": "success"},
+            ]
+
+            results = scrape_companies_sync(["https://test1.com", "https://test2.com"])
+
+            assert len(results) == 2
+            assert results[0]["url"] == "https://test1.com"
+            mock_run.assert_called_once()
+
 
 class TestScraperIntegration:
     """Integration tests for the scraper."""
@@ -216,11 +244,10 @@ class TestScraperIntegration:
         </html>
         """
         mock_response.raise_for_status.return_value = None
+        mock_response.headers = {"content-type": "text/html"}
 
         with patch("httpx.AsyncClient") as mock_client:
-            mock_client.return_value.__aenter__.return_value.get.return_value = (
-                mock_response
-            )
+            mock_client.return_value.get = AsyncMock(return_value=mock_response)
 
             result = await scraper.scrape_company("https://construction-company.com")
 
@@ -248,6 +275,7 @@ class TestScraperIntegration:
         </html>
         """
         homepage_response.raise_for_status.return_value = None
+        homepage_response.headers = {"content-type": "text/html"}
 
         # Mock about page response
         about_response = Mock()
@@ -260,12 +288,12 @@ class TestScraperIntegration:
         </html>
         """
         about_response.raise_for_status.return_value = None
+        about_response.headers = {"content-type": "text/html"}
 
         with patch("httpx.AsyncClient") as mock_client:
-            mock_client.return_value.__aenter__.return_value.get.side_effect = [
-                homepage_response,
-                about_response,
-            ]
+            mock_client.return_value.get = AsyncMock(
+                side_effect=[homepage_response, about_response]
+            )
 
             result = await scraper.scrape_company("https://test.com")
 
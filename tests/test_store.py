@@ -11,9 +11,43 @@ import tempfile
 from pathlib import Path
 from unittest.mock import Mock, patch
 
+import httpx
 import pytest
 
-from thinkbridge.store import VectorStore
+from thinkbridge.store import VectorStore, _retry
+
+
+def test_retry_recovers_from_transient_errors() -> None:
+    """Transient HTTP errors are retried; the call eventually succeeds."""
+    calls = {"count": 0}
+
+    @_retry(max_retries=3, base=0.0, cap=0.0)
+    def flaky() -> str:
+        calls["count"] += 1
+        if calls["count"] < 3:
+            request = httpx.Request("GET", "https://api.test")
+            response = httpx.Response(500, request=request)
+            raise httpx.HTTPStatusError(
+                "server error", request=request, response=response
+            )
+        return "ok"
+
+    assert flaky() == "ok"
+    assert calls["count"] == 3
+
+
+def test_retry_raises_non_transient_errors() -> None:
+    """Non-transient errors propagate without retries."""
+    calls = {"count": 0}
+
+    @_retry(max_retries=3, base=0.0, cap=0.0)
+    def broken() -> None:
+        calls["count"] += 1
+        raise ValueError("bad input")
+
+    with pytest.raises(ValueError):
+        broken()
+    assert calls["count"] == 1
 
 
 class TestVectorStore:
@@ -45,30 +79,14 @@ class TestVectorStore:
             client.files.create.return_value = mock_file
             client.beta.vector_stores.files.create.return_value = Mock()
 
-            # Mock assistant and thread operations for search
-            mock_assistant = Mock()
-            mock_assistant.id = "asst_test123"
-            client.beta.assistants.create.return_value = mock_assistant
+            # Mock vector store search for similarity queries
+            mock_search_result = Mock()
+            mock_search_result.score = 0.85
+            mock_search_result.content = [Mock(text="Test search result content")]
 
-            mock_thread = Mock()
-            mock_thread.id = "thread_test123"
-            client.beta.threads.create.return_value = mock_thread
-
-            mock_run = Mock()
-            mock_run.status = "completed"
-            mock_run.id = "run_test123"
-            client.beta.threads.runs.create.return_value = mock_run
-            client.beta.threads.runs.retrieve.return_value = mock_run
-
-            # Mock message response
-            mock_message = Mock()
-            mock_message.role = "assistant"
-            mock_message.content = [Mock()]
-            mock_message.content[0].text.value = "Test search result content"
-
-            mock_messages = Mock()
-            mock_messages.data = [mock_message]
-            client.beta.threads.messages.list.return_value = mock_messages
+            mock_search_response = Mock()
+            mock_search_response.data = [mock_search_result]
+            client.vector_stores.search.return_value = mock_search_response
 
             yield client
 
@@ -214,6 +232,65 @@ class TestVectorStore:
         with pytest.raises(ValueError, match="No chunks provided"):
             store.upload_chunks_to_store("test_company", [])
 
+    def test_upload_chunks_batched(self, mock_openai_client):
+        """Test batched upload embeds all companies in one API call."""
+        store = VectorStore(api_key="test_key")
+        store.company_stores["company_a"] = "vs_a"
+        store.company_stores["company_b"] = "vs_b"
+
+        items = [
+            ("company_a", ["Chunk for company A"], None),
+            ("company_b", ["Chunk for company B"], None),
+        ]
+
+        with patch("builtins.open", create=True):
+            results = store.upload_chunks_batched(items)
+
+        assert [store_id for store_id, _ in results] == ["vs_a", "vs_b"]
+        store.client.embeddings.create.assert_called_once()
+        assert store.has_local_index("company_a") is True
+        assert store.has_local_index("company_b") is True
+        assert sum(cost for _, cost in results) == pytest.approx(
+            store.total_cost
+        )
+
+    def test_embed_queries_single_call(self, mock_openai_client):
+        """Test that query embedding is a single batched API call."""
+        store = VectorStore(api_key="test_key")
+
+        vectors = store.embed_queries(["query one", "query two"])
+
+        assert vectors == [[0.1, 0.2, 0.3], [0.4, 0.5, 0.6]]
+        store.client.embeddings.create.assert_called_once()
+
+    def test_similarity_search_vectors(self, mock_openai_client):
+        """Test local vector search against an indexed company."""
+        store = VectorStore(api_key="test_key")
+        store._chunk_index["test_company"] = store._build_quantized_index(
+            ["First chunk", "Second chunk"],
+            [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0]],
+        )
+
+        assert store.has_local_index("test_company") is True
+        assert store.has_local_index("other_company") is False
+
+        results = store.similarity_search_vectors(
+            [1.0, 0.0, 0.0], "test_company", top_k=2
+        )
+
+        # Only the aligned chunk passes the max_distance threshold
+        assert len(results) == 1
+        assert results[0][0] == "First chunk"
+        assert results[0][1] == pytest.approx(1.0, abs=0.02)
+
+    def test_similarity_search_vectors_no_index(self, mock_openai_client):
+        """Test local vector search without an index returns nothing."""
+        store = VectorStore(api_key="test_key")
+
+        results = store.similarity_search_vectors([1.0, 0.0, 0.0], "missing_company")
+
+        assert results == []
+
     def test_similarity_search_success(self, mock_openai_client):
         """Test successful similarity search."""
         store = VectorStore(api_key="test_key")
@@ -318,30 +395,14 @@ class TestVectorStoreIntegration:
             client.files.create.return_value = mock_file
             client.beta.vector_stores.files.create.return_value = Mock()
 
-            # Mock assistant and thread operations for search
-            mock_assistant = Mock()
-            mock_assistant.id = "asst_test123"
-            client.beta.assistants.create.return_value = mock_assistant
-
-            mock_thread = Mock()
-            mock_thread.id = "thread_test123"
-            client.beta.threads.create.return_value = mock_thread
-
-            mock_run = Mock()
-            mock_run.status = "completed"
-            mock_run.id = "run_test123"
-            client.beta.threads.runs.create.return_value = mock_run
-            client.beta.threads.runs.retrieve.return_value = mock_run
-
-            # Mock message response
-            mock_message = Mock()
-            mock_message.role = "assistant"
-            mock_message.content = [Mock()]
-            mock_message.content[0].text.value = "Test search result content"
-
-            mock_messages = Mock()
-            mock_messages.data = [mock_message]
-            client.beta.threads.messages.list.return_value = mock_messages
+            # Mock vector store search for similarity queries
+            mock_search_result = Mock()
+            mock_search_result.score = 0.85
+            mock_search_result.content = [Mock(text="Test search result content")]
+
+            mock_search_response = Mock()
+            mock_search_response.data = [mock_search_result]
+            client.vector_stores.search.return_value = mock_search_response
 
             yield client
 